@@ -0,0 +1,136 @@
+"""
+Per-route admission control.
+
+Expensive endpoints run under a Limiter: at most CONCURRENCY requests in
+progress and QUEUE more waiting (first come, first served) for a slot.
+Anything beyond that is rejected immediately with AdmissionRejected, which
+the API turns into 429 + Retry-After, so a burst sheds load instead of
+piling up memory and timeouts for every client.
+
+Limits come from ADMISSION_<ROUTE>_CONCURRENCY / ADMISSION_<ROUTE>_QUEUE
+(a concurrency of 0 disables the limit for that route).
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Bounds for the Retry-After sent with a rejection
+ADMISSION_MIN_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_MIN_RETRY_AFTER_SECONDS", "1"))
+ADMISSION_MAX_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_MAX_RETRY_AFTER_SECONDS", "30"))
+
+class AdmissionRejected(Exception):
+    """A route's slots and wait queue are all taken"""
+
+    def __init__(self, route, retry_after):
+        super().__init__(f"Too many concurrent {route} requests, try again shortly.")
+        self.route = route
+        self.retry_after = retry_after
+
+class Slot:
+    """One admitted request; release() is safe to call more than once"""
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._limiter._release(time.monotonic() - self._started)
+
+class Limiter:
+    def __init__(self, name, concurrency, queue):
+        prefix = f"ADMISSION_{name.upper()}_"
+        self.name = name
+        self.concurrency = int(os.getenv(prefix + "CONCURRENCY", str(concurrency)))
+        self.queue = int(os.getenv(prefix + "QUEUE", str(queue)))
+        self._active = 0
+        self._waiters = deque()
+        # Moving average of how long a slot is held, for Retry-After
+        self._avg_hold = None
+        self._stats = {"admitted": 0, "queued": 0, "rejected": 0, "max_queue_depth": 0}
+
+    def _retry_after(self) -> int:
+        if self._avg_hold is None or self.concurrency <= 0:
+            return ADMISSION_MIN_RETRY_AFTER_SECONDS
+        # Time for everyone already waiting to get a slot, at the current pace
+        estimate = math.ceil(self._avg_hold * (len(self._waiters) + 1) / self.concurrency)
+        return max(ADMISSION_MIN_RETRY_AFTER_SECONDS, min(ADMISSION_MAX_RETRY_AFTER_SECONDS, estimate))
+
+    async def acquire(self) -> Slot:
+        """Take a slot, waiting in the queue if needed; raises AdmissionRejected when the queue is full"""
+        if self.concurrency <= 0 or (self._active < self.concurrency and not self._waiters):
+            self._active += 1
+            self._stats["admitted"] += 1
+            return Slot(self)
+        if len(self._waiters) >= self.queue:
+            self._stats["rejected"] += 1
+            raise AdmissionRejected(self.name, self._retry_after())
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._stats["queued"] += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._waiters))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                # _release may already have skipped past it
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            else:
+                # A slot was handed over just as the caller went away
+                self._release(None)
+            raise
+        self._stats["admitted"] += 1
+        return Slot(self)
+
+    def _release(self, held_seconds):
+        if held_seconds is not None:
+            self._avg_hold = held_seconds if self._avg_hold is None else 0.9 * self._avg_hold + 0.1 * held_seconds
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            # A waiter cancelled in this same tick is already done; skip it
+            if not waiter.done():
+                # Hand the slot straight to the next waiter; _active is unchanged
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    @asynccontextmanager
+    async def admit(self):
+        slot = await self.acquire()
+        try:
+            yield slot
+        finally:
+            slot.release()
+
+    def stats(self) -> dict:
+        return {
+            **self._stats,
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "concurrency": self.concurrency,
+            "queue_size": self.queue,
+            "avg_hold_ms": round(1000 * self._avg_hold, 1) if self._avg_hold is not None else None,
+        }
+
+limiters = {
+    # PDF parsing: CPU and memory bound
+    "parse_resume": Limiter("parse_resume", concurrency=8, queue=32),
+    "parse_resume_batch": Limiter("parse_resume_batch", concurrency=2, queue=4),
+    # /chat and /chat/stream
+    "chat": Limiter("chat", concurrency=64, queue=256),
+    "tech_questions": Limiter("tech_questions", concurrency=32, queue=128),
+    "candidate_search": Limiter("candidate_search", concurrency=16, queue=64),
+    "candidate_batch": Limiter("candidate_batch", concurrency=4, queue=16),
+}
+
+def admission_stats() -> dict:
+    return {name: limiter.stats() for name, limiter in limiters.items()}
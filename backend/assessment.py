@@ -0,0 +1,104 @@
+"""
+Rolling per-session interview assessment.
+
+After each recorded answer a background task folds only the new
+exchanges into the session's running assessment (one small LLM call over
+the previous assessment plus the delta, never the whole transcript). The
+assessment is kept in the structured report format, so the final summary
+is the latest version, plus at most one delta call for answers the
+background task hasn't covered yet.
+"""
+import asyncio
+import time
+from .conversation_store import get_history, get_profile, get_assessment, save_assessment
+from .llm_client import achat_with_llm, BACKGROUND
+from .prompt_builder import candidate_info_lines, fit_to_budget
+
+ASSESSMENT_INSTRUCTIONS = """You maintain a running assessment of a candidate during a technical screening interview.
+You receive the current assessment and the newest interview exchanges. Return the full updated assessment,
+revising earlier judgements only when the new answers justify it. Use exactly these sections:
+1. Overall Assessment (1-2 short paragraphs)
+2. Technical Skills Evaluation
+3. Communication Skills
+4. Strengths Identified
+5. Areas for Improvement
+6. Recommendation (Hire/Don't Hire/Further Review)
+7. Suggested Next Steps
+Stay under 350 words. Keep it professional and objective."""
+
+_locks = {}
+
+class _SessionLock:
+    """Per-session asyncio.Lock that is dropped once nobody holds or waits for it"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+
+    async def __aenter__(self):
+        lock, users = _locks.get(self.session_id, (None, 0))
+        lock = lock or asyncio.Lock()
+        _locks[self.session_id] = (lock, users + 1)
+        await lock.acquire()
+
+    async def __aexit__(self, *exc):
+        lock, users = _locks[self.session_id]
+        lock.release()
+        if users == 1:
+            del _locks[self.session_id]
+        else:
+            _locks[self.session_id] = (lock, users - 1)
+
+def _has_new_answers(messages) -> bool:
+    return any(m.get("role") == "user" for m in messages)
+
+def _assessment_messages(profile, current, new_messages):
+    header = ASSESSMENT_INSTRUCTIONS
+    if profile:
+        header += f"\n\nCandidate Info:\n{candidate_info_lines(profile)}"
+    return [
+        {"role": "system", "content": header},
+        {"role": "system", "content": f"Current assessment:\n{current or '(none yet - this is the start of the interview)'}"},
+        *new_messages,
+        {"role": "user", "content": "Update the assessment with the exchanges above."},
+    ]
+
+def _load_state(session_id: str):
+    assessment = get_assessment(session_id) or {"summary": None, "turns_covered": 0}
+    return get_history(session_id), assessment, get_profile(session_id)
+
+def _save_if_active(session_id: str, assessment: dict):
+    # Session cleared while the LLM was running: don't recreate it
+    if get_history(session_id):
+        save_assessment(session_id, assessment)
+
+async def update_assessment(session_id: str) -> dict:
+    """Fold transcript messages not yet covered into the assessment; no-op if up to date"""
+    async with _SessionLock(session_id):
+        history, assessment, profile = await asyncio.to_thread(_load_state, session_id)
+        new_messages = history[assessment["turns_covered"]:]
+        if not _has_new_answers(new_messages):
+            return assessment
+        messages = fit_to_budget(_assessment_messages(profile, assessment["summary"], new_messages))
+        summary = await achat_with_llm(messages, priority=BACKGROUND, route="summary")
+        assessment = {"summary": summary, "turns_covered": len(history), "updated_at": time.time()}
+        await asyncio.to_thread(_save_if_active, session_id, assessment)
+        return assessment
+
+async def update_assessment_in_background(session_id: str):
+    """BackgroundTask entry point: failures are logged, the next answer retries"""
+    try:
+        await update_assessment(session_id)
+    except Exception as e:
+        print(f"Error updating assessment for session_id={session_id}: {e}")
+
+def assessment_status(session_id: str) -> dict:
+    assessment = get_assessment(session_id) or {"summary": None, "turns_covered": 0}
+    history = get_history(session_id)
+    return {
+        "session_id": session_id,
+        "summary": assessment["summary"],
+        "turns_covered": assessment["turns_covered"],
+        "total_turns": len(history),
+        "up_to_date": not _has_new_answers(history[assessment["turns_covered"]:]),
+        "updated_at": assessment.get("updated_at"),
+    }
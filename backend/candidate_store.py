@@ -0,0 +1,278 @@
+"""
+Candidate storage behind one interface, with the backend chosen by config.
+
+CANDIDATE_STORE selects:
+
+- `qdrant`: a Qdrant server at QDRANT_HOST (default)
+- `qdrant-local`: in-process Qdrant, in memory (`QDRANT_PATH=:memory:`)
+  or persisted to a directory
+- `sqlite`: a single SQLite file (CANDIDATE_DB_PATH) with NumPy
+  brute-force similarity search, for tests and small offline runs
+
+The store is created on first use rather than at import or startup, so
+the API serves `/` and `/greet` (and reports 503 for storage calls) while
+storage is unreachable. A failed connect is remembered for
+CANDIDATE_STORE_RETRY_SECONDS; calls in that window fail fast instead of
+queueing up behind another connect attempt.
+"""
+import asyncio
+import atexit
+import os
+import threading
+import time
+import uuid
+from dotenv import load_dotenv
+from .embeddings import embed_candidates
+
+load_dotenv()
+
+CANDIDATE_STORE = os.getenv("CANDIDATE_STORE", "qdrant").strip().lower()
+QDRANT_PATH = os.getenv("QDRANT_PATH", ":memory:")
+CANDIDATE_DB_PATH = os.getenv("CANDIDATE_DB_PATH", "candidates.db")
+# Stored candidates expire this long after their last write (0 = never)
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+# After a failed connect, fail fast for this long before trying again
+CANDIDATE_STORE_RETRY_SECONDS = float(os.getenv("CANDIDATE_STORE_RETRY_SECONDS", "5"))
+
+# Fixed namespace so a candidate's point ID is the same in every process
+CANDIDATE_ID_NAMESPACE = uuid.UUID("5b0f7d2e-3c1a-5e8b-9a64-7d2c1f0e4b93")
+
+class StorageUnavailable(Exception):
+    """The configured candidate store could not be initialised"""
+
+class CandidateStore:
+    """Interface implemented by every backend.
+
+    Points are (point_id, payload, vector) tuples; payloads are candidate
+    dicts (with integer `created_at`/`expires_at` epoch seconds) and vectors
+    are lists of floats. `query` for search is either a vector or the point
+    ID of a stored candidate.
+    """
+
+    def setup(self):
+        """Create collections/tables and indexes; must be idempotent"""
+        raise NotImplementedError
+
+    def upsert(self, points, wait=True):
+        raise NotImplementedError
+
+    def retrieve(self, point_id):
+        """Payload stored under point_id, or None"""
+        raise NotImplementedError
+
+    def search(self, query, limit=10, min_years_experience=None, max_years_experience=None,
+               locations=None, exclude_id=None):
+        """List of (score, payload), best first"""
+        raise NotImplementedError
+
+    def delete_sessions(self, session_ids):
+        """Delete every point belonging to any of session_ids"""
+        raise NotImplementedError
+
+    def delete_session(self, session_id):
+        self.delete_sessions([session_id])
+
+    def delete_expired(self, now, limit):
+        """Delete up to `limit` points with expires_at < now; returns how many"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    # Async variants used by the API. Backends without a native async client
+    # run the sync call in a worker thread.
+
+    async def aupsert(self, points, wait=True):
+        await asyncio.to_thread(self.upsert, points, wait)
+
+    async def aretrieve(self, point_id):
+        return await asyncio.to_thread(self.retrieve, point_id)
+
+    async def asearch(self, query, limit=10, **filters):
+        return await asyncio.to_thread(self.search, query, limit, **filters)
+
+    async def adelete_sessions(self, session_ids):
+        await asyncio.to_thread(self.delete_sessions, session_ids)
+
+    async def adelete_session(self, session_id):
+        await self.adelete_sessions([session_id])
+
+    async def adelete_expired(self, now, limit):
+        return await asyncio.to_thread(self.delete_expired, now, limit)
+
+    async def aclose(self):
+        pass
+
+def normalize_email(email: str) -> str:
+    return (email or "").strip().lower()
+
+def candidate_point_id(email: str) -> str:
+    """Stable point ID (UUIDv5 of the normalized email); re-submissions overwrite in place"""
+    return str(uuid.uuid5(CANDIDATE_ID_NAMESPACE, normalize_email(email)))
+
+def _with_expiry(candidate_dict, now):
+    payload = {**candidate_dict, "created_at": now}
+    if SESSION_TTL_SECONDS > 0:
+        payload["expires_at"] = now + SESSION_TTL_SECONDS
+    return payload
+
+def candidate_points(candidate_dicts):
+    """(point_id, payload, vector) tuples, with embeddings computed in one batch"""
+    vectors = embed_candidates(candidate_dicts)
+    now = int(time.time())
+    return [
+        (candidate_point_id(candidate_dict.get("email", "")), _with_expiry(candidate_dict, now), vector.tolist())
+        for candidate_dict, vector in zip(candidate_dicts, vectors)
+    ]
+
+def _build_store() -> CandidateStore:
+    if CANDIDATE_STORE == "qdrant":
+        from .qdrant_client import QdrantCandidateStore, remote_client, remote_async_client
+        return QdrantCandidateStore(remote_client(), async_client_factory=remote_async_client)
+    if CANDIDATE_STORE == "qdrant-local":
+        from .qdrant_client import QdrantCandidateStore, local_client
+        # The in-process engine is not thread-safe
+        return QdrantCandidateStore(local_client(QDRANT_PATH), serialize=True)
+    if CANDIDATE_STORE == "sqlite":
+        from .sqlite_candidate_store import SqliteCandidateStore
+        return SqliteCandidateStore(CANDIDATE_DB_PATH)
+    raise ValueError(f"Unknown CANDIDATE_STORE {CANDIDATE_STORE!r} (expected qdrant, qdrant-local or sqlite)")
+
+_store = None
+_store_lock = threading.Lock()
+_last_error = None
+_failed_at = None
+
+def _check_cooldown():
+    """Raise StorageUnavailable while a recent connect failure is still cooling down"""
+    if _failed_at is not None and time.monotonic() - _failed_at < CANDIDATE_STORE_RETRY_SECONDS:
+        raise StorageUnavailable(f"Candidate store ({CANDIDATE_STORE}) unavailable: {_last_error}")
+
+def get_store() -> CandidateStore:
+    """The process-wide store, created and set up on first use"""
+    global _store, _last_error, _failed_at
+    if _store is not None:
+        return _store
+    _check_cooldown()
+    with _store_lock:
+        if _store is None:
+            # Callers that queued behind a failing attempt share its result
+            _check_cooldown()
+            try:
+                store = _build_store()
+                store.setup()
+            except Exception as e:
+                _last_error, _failed_at = str(e), time.monotonic()
+                raise StorageUnavailable(f"Candidate store ({CANDIDATE_STORE}) unavailable: {e}") from e
+            _store, _last_error, _failed_at = store, None, None
+            # Close before interpreter teardown (the on-disk local engine flushes on close)
+            atexit.register(close_store)
+            print(f"Candidate store ready ({CANDIDATE_STORE})")
+    return _store
+
+async def aget_store() -> CandidateStore:
+    """get_store without blocking the event loop on first-use setup"""
+    if _store is not None:
+        return _store
+    _check_cooldown()
+    return await asyncio.to_thread(get_store)
+
+def init_store():
+    """Best-effort warm-up at startup; failures are logged and retried on first use"""
+    try:
+        get_store()
+    except StorageUnavailable as e:
+        print(e)
+
+def close_store():
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            _store = None
+
+async def aclose_store():
+    """Close the store's async client (must run on the loop that used it), then the store"""
+    if _store is not None:
+        await _store.aclose()
+    close_store()
+
+def store_status() -> dict:
+    return {
+        "backend": CANDIDATE_STORE,
+        "ready": _store is not None,
+        "last_error": _last_error,
+        "retry_in_seconds": round(max(0.0, _failed_at + CANDIDATE_STORE_RETRY_SECONDS - time.monotonic()), 1)
+        if _failed_at is not None else None,
+    }
+
+def store_candidate(candidate_dict):
+    store_candidates([candidate_dict])
+
+def store_candidates(candidate_dicts, wait=True):
+    """Embed and upsert candidates in one batch; returns the number stored"""
+    if not candidate_dicts:
+        return 0
+    points = candidate_points(candidate_dicts)
+    get_store().upsert(points, wait=wait)
+    return len(points)
+
+def get_candidate(email: str):
+    """Stored candidate payload for an email, or None (a point lookup, not a filter scan)"""
+    return get_store().retrieve(candidate_point_id(email))
+
+def search_candidates(query, limit=10, min_years_experience=None, max_years_experience=None,
+                      locations=None, exclude_email=None):
+    """Top-k candidates by cosine similarity with optional payload filters.
+
+    `query` is a vector or a candidate's point ID ("more like this one").
+    Returns a list of (score, payload).
+    """
+    return get_store().search(
+        query,
+        limit=limit,
+        min_years_experience=min_years_experience,
+        max_years_experience=max_years_experience,
+        locations=locations,
+        exclude_id=candidate_point_id(exclude_email) if exclude_email else None,
+    )
+
+def delete_session_data(session_id: str) -> bool:
+    try:
+        get_store().delete_session(session_id)
+        print(f"Deleted all candidate data with session_id={session_id} ({CANDIDATE_STORE}).")
+        return True
+    except Exception as e:
+        print(f"Error deleting session data for session_id={session_id}: {e}")
+        return False
+
+async def astore_candidates(candidate_dicts, wait=True):
+    if not candidate_dicts:
+        return 0
+    # Embedding a large batch is CPU work; keep it off the event loop
+    points = await asyncio.to_thread(candidate_points, candidate_dicts)
+    await (await aget_store()).aupsert(points, wait=wait)
+    return len(points)
+
+async def aget_candidate(email: str):
+    return await (await aget_store()).aretrieve(candidate_point_id(email))
+
+async def asearch_candidates(query, limit=10, min_years_experience=None, max_years_experience=None,
+                             locations=None, exclude_email=None):
+    return await (await aget_store()).asearch(
+        query,
+        limit=limit,
+        min_years_experience=min_years_experience,
+        max_years_experience=max_years_experience,
+        locations=locations,
+        exclude_id=candidate_point_id(exclude_email) if exclude_email else None,
+    )
+
+async def adelete_session_data(session_id: str) -> bool:
+    try:
+        await (await aget_store()).adelete_session(session_id)
+        print(f"Deleted all candidate data with session_id={session_id} ({CANDIDATE_STORE}).")
+        return True
+    except Exception as e:
+        print(f"Error deleting session data for session_id={session_id}: {e}")
+        return False
@@ -0,0 +1,83 @@
+import os
+import threading
+from dotenv import load_dotenv
+from .cache_utils import LRUTTLCache, SqliteKV
+
+load_dotenv()
+
+CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", "1000"))
+CONVERSATION_TTL_SECONDS = float(os.getenv("CONVERSATION_TTL_SECONDS", "7200"))
+# Set to an empty string to keep transcripts in memory only
+CONVERSATION_DB_PATH = os.getenv("CONVERSATION_DB_PATH", "conversations.db")
+
+_memory = LRUTTLCache(max_size=CONVERSATION_CACHE_SIZE, ttl=CONVERSATION_TTL_SECONDS)
+_durable = SqliteKV(CONVERSATION_DB_PATH, table="conversations") if CONVERSATION_DB_PATH else None
+_lock = threading.Lock()
+
+def _load(session_id: str) -> dict:
+    record = _memory.get(session_id)
+    if record is None and _durable is not None:
+        record = _durable.get(session_id)
+        if record is not None:
+            _memory.set(session_id, record)
+    return record or {"messages": []}
+
+def _save(session_id: str, record: dict):
+    _memory.set(session_id, record)
+    if _durable is not None:
+        _durable.set(session_id, record)
+
+def get_history(session_id: str) -> list:
+    """Return a copy of the stored transcript for a session (oldest first)"""
+    return list(_load(session_id)["messages"])
+
+def append_messages(session_id: str, messages: list):
+    """Append chat messages ({"role", "content"} dicts) to a session's transcript"""
+    with _lock:
+        record = _load(session_id)
+        record = {**record, "messages": record["messages"] + list(messages)}
+        _save(session_id, record)
+
+def get_profile(session_id: str):
+    """Return the CandidateInfo dict saved for a session, or None"""
+    return _load(session_id).get("profile")
+
+def save_profile(session_id: str, profile: dict):
+    with _lock:
+        record = _load(session_id)
+        _save(session_id, {**record, "profile": profile})
+
+def save_new_profiles(profiles: dict):
+    """Save profiles for brand-new sessions (session_id -> profile) in one write.
+
+    With the durable tier they bypass the in-memory LRU, so bulk imports
+    don't evict live interview transcripts; they are cached on first use.
+    """
+    records = [(session_id, {"messages": [], "profile": profile}) for session_id, profile in profiles.items()]
+    if _durable is not None:
+        _durable.set_many(records)
+    else:
+        for session_id, record in records:
+            _memory.set(session_id, record)
+
+def get_assessment(session_id: str):
+    """Return the rolling assessment saved for a session, or None"""
+    return _load(session_id).get("assessment")
+
+def save_assessment(session_id: str, assessment: dict):
+    with _lock:
+        record = _load(session_id)
+        _save(session_id, {**record, "assessment": assessment})
+
+def delete_conversation(session_id: str):
+    with _lock:
+        _memory.pop(session_id)
+        if _durable is not None:
+            _durable.delete(session_id)
+
+def purge_conversations(older_than: float) -> int:
+    """Drop expired in-memory transcripts and durable ones last written before `older_than`"""
+    removed = _memory.purge_expired()
+    if _durable is not None:
+        removed += _durable.delete_older_than(older_than)
+    return removed
@@ -0,0 +1,96 @@
+"""
+Local, CPU-only candidate embeddings (no model download, no network).
+
+A signed hashing vectorizer over three feature groups:
+
+- skills from the tech stack, canonicalized through the skill taxonomy so
+  "k8s" and "Kubernetes" land in the same bucket,
+- words of the desired position / current role,
+- a coarse experience band, so neighbours in seniority score higher.
+
+Feature hashes use CRC32, which is stable across processes (unlike
+Python's salted `hash`), so stored vectors stay comparable with query
+vectors computed after a restart. Vectors are L2-normalized for cosine
+search.
+"""
+import re
+import zlib
+import numpy as np
+from .skill_matcher import get_skill_matcher
+
+# Must match the collection's vector size
+EMBEDDING_DIM = 128
+SKILL_WEIGHT = 1.0
+ROLE_WEIGHT = 0.5
+EXPERIENCE_WEIGHT = 0.3
+
+WORD_PATTERN = re.compile(r"[a-z0-9+#.]+")
+# Words that say nothing about the role
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is of on or the to with we you our "
+    "who will looking experience years year candidate candidates".split()
+)
+EXPERIENCE_BANDS = ((0, "0-1"), (2, "2-4"), (5, "5-9"), (10, "10+"))
+
+def _experience_band(years) -> str:
+    band = EXPERIENCE_BANDS[0][1]
+    for floor, label in EXPERIENCE_BANDS:
+        if years >= floor:
+            band = label
+    return band
+
+def _words(text: str) -> list:
+    return [w.strip(".") for w in WORD_PATTERN.findall((text or "").lower())
+            if w.strip(".") and w.strip(".") not in STOP_WORDS]
+
+def _canonical_skill(skill: str) -> str:
+    return (get_skill_matcher().fuzzy_match(skill) or skill).strip().lower()
+
+def candidate_features(candidate: dict) -> list:
+    """(feature, weight) pairs for a stored candidate dict"""
+    features = [(f"skill:{_canonical_skill(s)}", SKILL_WEIGHT) for s in candidate.get("tech_stack") or [] if s.strip()]
+    role_text = f"{candidate.get('desired_position') or ''} {candidate.get('current_role') or ''}"
+    features += [(f"word:{w}", ROLE_WEIGHT) for w in _words(role_text)]
+    years = candidate.get("years_experience")
+    if isinstance(years, int):
+        features.append((f"exp:{_experience_band(years)}", EXPERIENCE_WEIGHT))
+    return features
+
+def query_features(text: str = "", tech_stack=None, years_experience=None) -> list:
+    """(feature, weight) pairs for a free-text query such as a job description"""
+    skills = list(tech_stack or []) + get_skill_matcher().find_all(text or "")
+    features = [(f"skill:{_canonical_skill(s)}", SKILL_WEIGHT) for s in skills if s.strip()]
+    skill_words = {w for s in skills for w in _words(s)}
+    features += [(f"word:{w}", ROLE_WEIGHT) for w in _words(text) if w not in skill_words]
+    if years_experience is not None:
+        features.append((f"exp:{_experience_band(years_experience)}", EXPERIENCE_WEIGHT))
+    return features
+
+def _bucket_and_sign(feature: str):
+    h = zlib.crc32(feature.encode("utf-8"))
+    return h % EMBEDDING_DIM, 1.0 if (h >> 31) & 1 else -1.0
+
+def encode_features(feature_lists) -> np.ndarray:
+    """Batch-encode lists of (feature, weight) into an (n, EMBEDDING_DIM) float32 matrix.
+
+    Rows with no features stay all-zero; callers decide how to handle them.
+    """
+    rows, cols, values = [], [], []
+    for row, features in enumerate(feature_lists):
+        for feature, weight in features:
+            col, sign = _bucket_and_sign(feature)
+            rows.append(row)
+            cols.append(col)
+            values.append(sign * weight)
+    matrix = np.zeros((len(feature_lists), EMBEDDING_DIM), dtype=np.float32)
+    if rows:
+        np.add.at(matrix, (np.array(rows), np.array(cols)), np.array(values, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+def embed_candidates(candidates) -> np.ndarray:
+    return encode_features([candidate_features(c) for c in candidates])
+
+def embed_query(text: str = "", tech_stack=None, years_experience=None) -> np.ndarray:
+    return encode_features([query_features(text, tech_stack, years_experience)])[0]
@@ -0,0 +1,175 @@
+"""
+In-process job queue for long LLM tasks.
+
+Handlers are registered by name; `submit` puts a job on a bounded asyncio
+queue and returns its record (with an `id`) immediately, and a fixed pool
+of workers runs jobs with a per-job timeout. Clients poll `GET /jobs/{id}`.
+
+- Jobs submitted with a `key` are deduplicated: while one is queued or
+  running, or its result is still cached, the existing job is returned.
+- Finished jobs (results or errors) are kept for JOB_RESULT_TTL_SECONDS.
+- With JOB_DB_PATH set, job records are written to SQLite on every state
+  change; queued or interrupted jobs are re-queued on the next start.
+"""
+import asyncio
+import os
+import time
+import uuid
+from dotenv import load_dotenv
+from .cache_utils import LRUTTLCache, SqliteKV
+
+load_dotenv()
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "256"))
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "120"))
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+JOB_RESULT_CACHE_SIZE = int(os.getenv("JOB_RESULT_CACHE_SIZE", "2048"))
+# Optional SQLite file so jobs survive restarts (empty = memory only)
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "")
+
+class JobQueueFull(Exception):
+    """Raised by submit when JOB_QUEUE_SIZE jobs are already waiting"""
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, queue_size=JOB_QUEUE_SIZE, timeout=JOB_TIMEOUT_SECONDS,
+                 result_ttl=JOB_RESULT_TTL_SECONDS, db_path=JOB_DB_PATH):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self._handlers = {}
+        self._active = {}
+        self._finished = LRUTTLCache(max_size=JOB_RESULT_CACHE_SIZE, ttl=result_ttl)
+        # Dedup key -> job ID, kept as long as results are
+        self._by_key = LRUTTLCache(max_size=JOB_RESULT_CACHE_SIZE, ttl=result_ttl)
+        self._durable = SqliteKV(db_path, table="jobs") if db_path else None
+        self._queue = None
+        self._tasks = []
+        self._stats = {"submitted": 0, "deduplicated": 0, "rejected": 0, "succeeded": 0,
+                       "failed": 0, "timed_out": 0, "recovered": 0}
+
+    def register(self, kind, handler):
+        """handler is an async function called with the job's params as keyword arguments"""
+        self._handlers[kind] = handler
+
+    def _save(self, job):
+        if job["status"] in ("succeeded", "failed"):
+            self._active.pop(job["id"], None)
+            self._finished.set(job["id"], job)
+        else:
+            self._active[job["id"]] = job
+        if self._durable is not None:
+            self._durable.set(job["id"], job)
+
+    def get(self, job_id):
+        job = self._active.get(job_id) or self._finished.get(job_id)
+        if job is None and self._durable is not None:
+            job = self._durable.get(job_id)
+            if job is not None and job["status"] in ("succeeded", "failed"):
+                if time.time() - (job.get("finished_at") or 0) > self.result_ttl:
+                    return None
+                self._finished.set(job_id, job)
+        return job
+
+    def submit(self, kind, params=None, key=None):
+        """Queue a job and return its record; raises JobQueueFull when the queue is full"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if key is not None:
+            existing_id = self._by_key.get(key)
+            existing = self.get(existing_id) if existing_id else None
+            if existing is not None and existing["status"] != "failed":
+                self._stats["deduplicated"] += 1
+                return existing
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        if self._queue.full():
+            self._stats["rejected"] += 1
+            raise JobQueueFull(f"Job queue is full ({self.queue_size} jobs waiting)")
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "key": key,
+            "params": params or {},
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        self._save(job)
+        if key is not None:
+            self._by_key.set(key, job["id"])
+        self._queue.put_nowait(job["id"])
+        self._stats["submitted"] += 1
+        return job
+
+    async def _run(self, job_id):
+        job = self._active.get(job_id)
+        if job is None:
+            return
+        job = {**job, "status": "running", "started_at": time.time()}
+        self._save(job)
+        try:
+            result = await asyncio.wait_for(self._handlers[job["kind"]](**job["params"]), timeout=self.timeout)
+            job = {**job, "status": "succeeded", "result": result}
+            self._stats["succeeded"] += 1
+        except asyncio.TimeoutError:
+            job = {**job, "status": "failed", "error": f"Timed out after {self.timeout:.0f}s"}
+            self._stats["timed_out"] += 1
+        except Exception as e:
+            job = {**job, "status": "failed", "error": str(e)}
+            self._stats["failed"] += 1
+        job["finished_at"] = time.time()
+        self._save(job)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    def _recover(self):
+        """Reload persisted jobs: finished ones for polling, unfinished ones back onto the queue"""
+        cutoff = time.time() - self.result_ttl
+        self._durable.delete_older_than(cutoff)
+        for job in sorted(self._durable.values(), key=lambda j: j["created_at"]):
+            if job["key"] is not None:
+                self._by_key.set(job["key"], job["id"])
+            if job["status"] in ("succeeded", "failed"):
+                self._finished.set(job["id"], job)
+            elif job["kind"] in self._handlers and not self._queue.full():
+                self._save({**job, "status": "queued", "started_at": None})
+                self._queue.put_nowait(job["id"])
+                self._stats["recovered"] += 1
+
+    def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self._durable is not None:
+            self._recover()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel workers; unfinished jobs stay 'queued'/'running' in SQLite and resume on restart"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def stats(self):
+        return {
+            **self._stats,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "active": len(self._active),
+            "workers": self.workers,
+            "persistent": self._durable is not None,
+        }
+
+job_queue = JobQueue()
@@ -1,38 +1,502 @@
+import asyncio
+import bisect
+import heapq
+import itertools
 import os
-from openai import OpenAI
+import random
+import re
+import time
+from contextlib import asynccontextmanager, AsyncExitStack
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, APIStatusError, RateLimitError
 from dotenv import load_dotenv
+from .prompt_builder import count_message_tokens
 
 load_dotenv()
 
 api_key = os.getenv("GROQ_API_KEY")
-client = OpenAI(api_key=api_key, base_url="https://api.groq.com/openai/v1")
-model_name = "llama-3.1-8b-instant" 
+base_url = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+# Retries are done here (with the shared rate-limit state), not by the SDK
+client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+async_client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+model_name = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
 
-def generate_technical_questions(tech_stack):
+# Caps in-flight Groq calls from the async endpoints, independent of the
+# Starlette threadpool size.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))
+# Client-side budgets matching the Groq plan (0 = rely on rate-limit headers and 429s only)
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "0"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "0"))
+# Completion tokens reserved per call until the response reports real usage
+LLM_COMPLETION_TOKENS_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKENS_ESTIMATE", "300"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "0.5"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "20"))
+# Interactive calls fail fast (429) instead of waiting longer than this for budget
+LLM_INTERACTIVE_MAX_WAIT_SECONDS = float(os.getenv("LLM_INTERACTIVE_MAX_WAIT_SECONDS", "15"))
+
+# Scheduling priorities (lower is admitted first)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+class LLMRateLimited(Exception):
+    """The provider still answered 429 after LLM_MAX_RETRIES retries"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+def _parse_duration(value):
+    """Seconds from a header like '7.66s', '2m59.56s', '120ms' or a bare number"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    parts = _DURATION_PART.findall(value)
+    return sum(float(n) * scale[unit] for n, unit in parts) if parts else None
+
+def _header_number(headers, name):
+    try:
+        return float(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+def _retry_after(headers):
+    retry_after_ms = _header_number(headers, "retry-after-ms")
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000
+    return _header_number(headers, "retry-after")
+
+def _is_retryable(error):
+    if isinstance(error, APIConnectionError):
+        return True
+    return isinstance(error, APIStatusError) and (error.status_code in (408, 409, 429) or error.status_code >= 500)
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retrying `error`, or None if it shouldn't be retried"""
+    if attempt >= LLM_MAX_RETRIES or not _is_retryable(error):
+        return None
+    # Full jitter, so callers that failed together don't retry together
+    delay = random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+    if isinstance(error, APIStatusError):
+        delay = max(delay, _retry_after(error.response.headers) or 0)
+    return delay
+
+class TokenBucket:
+    """Refills `capacity` units per minute; capacity 0 disables the local budget.
+
+    `sync` folds in the provider's view from the rate-limit headers, and
+    `pause` blocks the bucket outright after a 429.
+    """
+
+    def __init__(self, capacity, period=60.0):
+        self.capacity = capacity
+        self.rate = capacity / period if capacity else 0.0
+        self.level = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        if self.capacity:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if not self.capacity:
+            return 0.0
+        self._refill(now)
+        # A single call larger than the whole budget still gets through once the bucket is full
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount, now):
+        """Consume `amount` (negative refunds); the level may go below zero as debt"""
+        if self.capacity:
+            self._refill(now)
+            self.level = min(self.capacity, self.level - amount)
+
+    def sync(self, remaining, reset, now):
+        if remaining is None:
+            return
+        if self.capacity:
+            self._refill(now)
+            self.level = min(self.level, remaining)
+        if remaining <= 0 and reset:
+            self.pause(reset, now)
+
+    def pause(self, seconds, now):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+class LLMScheduler:
+    """Admits async LLM calls in priority order within the concurrency cap and RPM/TPM budgets.
+
+    Waiting callers queue by (priority, arrival); only the head of the queue
+    is admitted, once a slot is free and both buckets can cover it, so
+    interactive calls overtake queued background work.
+    """
+
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, rpm=LLM_RPM_LIMIT, tpm=LLM_TPM_LIMIT):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self._in_flight = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+        self._stats = {"calls": 0, "retries": 0, "rate_limited": 0, "exhausted": 0, "wait_seconds": 0.0}
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _admission_delay(self, entry, tokens):
+        """0 to admit now, seconds until the budgets allow it, or None to wait for a change"""
+        if self._waiters[0] != entry or self._in_flight >= self.max_concurrency:
+            return None
+        now = time.monotonic()
+        return max(self.requests.wait_time(1, now), self.tokens.wait_time(tokens, now))
+
+    async def acquire(self, tokens, priority=INTERACTIVE, max_wait=None):
+        """Wait for admission; raises LLMRateLimited if the budgets won't allow it within max_wait"""
+        entry = (priority, next(self._seq))
+        heapq.heappush(self._waiters, entry)
+        started = time.monotonic()
+        try:
+            while True:
+                delay = self._admission_delay(entry, tokens)
+                if delay == 0:
+                    break
+                if delay is not None and max_wait is not None and time.monotonic() + delay > started + max_wait:
+                    self._stats["exhausted"] += 1
+                    raise LLMRateLimited("LLM rate limit budget exhausted", retry_after=delay)
+                try:
+                    await asyncio.wait_for(self._changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._wake()
+        now = time.monotonic()
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+        self._in_flight += 1
+        self._stats["calls"] += 1
+        self._stats["wait_seconds"] += now - started
+
+    def release(self, reserved, used=None):
+        """Free the slot; `used` (the response's total_tokens) settles the reservation"""
+        self._in_flight -= 1
+        if used:
+            self.tokens.take(used - reserved, time.monotonic())
+        self._wake()
+
+    def observe(self, headers):
+        now = time.monotonic()
+        self.requests.sync(_header_number(headers, "x-ratelimit-remaining-requests"),
+                           _parse_duration(headers.get("x-ratelimit-reset-requests")), now)
+        self.tokens.sync(_header_number(headers, "x-ratelimit-remaining-tokens"),
+                         _parse_duration(headers.get("x-ratelimit-reset-tokens")), now)
+
+    def failed(self, error, attempt, max_wait=None):
+        """Record a failed attempt; returns the retry delay, or None when it's final.
+
+        A rate-limited call whose backoff would exceed max_wait is final too.
+        """
+        delay = _retry_delay(error, attempt)
+        if isinstance(error, RateLimitError):
+            self._stats["rate_limited"] += 1
+            self.observe(error.response.headers)
+            # Hold everyone off, not just this caller, until the provider's window resets
+            pause = _retry_after(error.response.headers) or delay or 0
+            now = time.monotonic()
+            self.requests.pause(pause, now)
+            self.tokens.pause(pause, now)
+            if delay is not None and max_wait is not None and delay > max_wait:
+                delay = None
+            if delay is None:
+                self._stats["exhausted"] += 1
+        if delay is not None:
+            self._stats["retries"] += 1
+        return delay
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            **self._stats,
+            "wait_seconds": round(self._stats["wait_seconds"], 3),
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "waiting_background": sum(1 for priority, _ in self._waiters if priority >= BACKGROUND),
+            "max_concurrency": self.max_concurrency,
+            "rpm_limit": self.requests.capacity,
+            "tpm_limit": self.tokens.capacity,
+            "paused_seconds": round(max(self.requests.blocked_until, self.tokens.blocked_until, now) - now, 2),
+        }
+
+scheduler = LLMScheduler()
+
+# Upper bounds (seconds) of the per-route latency histogram buckets
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (None past the last bucket)"""
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> dict:
+        cumulative, buckets = 0, {}
+        for bound, n in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += n
+            buckets[f"le_{bound}"] = cumulative
+        return {
+            "count": self.count,
+            "mean_ms": round(1000 * self.total / self.count, 1) if self.count else None,
+            "p50_le_s": self.quantile(0.5) if self.count else None,
+            "p99_le_s": self.quantile(0.99) if self.count else None,
+            "buckets": buckets,
+        }
+
+_clients = {}
+
+def _clients_for(url, key):
+    """Sync and async clients per endpoint, shared by routes that point at the same one"""
+    if (url, key) not in _clients:
+        if (url, key) == (base_url, api_key):
+            _clients[url, key] = (client, async_client)
+        else:
+            _clients[url, key] = (OpenAI(api_key=key, base_url=url, max_retries=0),
+                                  AsyncOpenAI(api_key=key, base_url=url, max_retries=0))
+    return _clients[url, key]
+
+class LLMRoute:
+    """Model, endpoint, timeouts and hedging for one kind of call, read from LLM_<NAME>_* variables.
+
+    timeout bounds a single attempt; deadline bounds the whole call (queueing,
+    retries, backoff and hedges) up to the response or the first stream chunk.
+    With hedge_after set, a call that hasn't produced output (the whole
+    response, or the first chunk of a stream) within that many seconds gets
+    a second identical request, and whichever answers first is used.
+    """
+
+    def __init__(self, name, timeout, deadline, hedge_after=0.0):
+        prefix = f"LLM_{name.upper()}_"
+        self.name = name
+        self.model = os.getenv(prefix + "MODEL", model_name)
+        self.base_url = os.getenv(prefix + "BASE_URL", base_url)
+        self.client, self.async_client = _clients_for(self.base_url, os.getenv(prefix + "API_KEY", api_key))
+        self.timeout = float(os.getenv(prefix + "TIMEOUT_SECONDS", str(timeout)))
+        self.deadline = float(os.getenv(prefix + "DEADLINE_SECONDS", str(deadline)))
+        self.hedge_after = float(os.getenv(prefix + "HEDGE_AFTER_SECONDS", str(hedge_after)))
+        self.latency = LatencyHistogram()
+        self._stats = {"calls": 0, "errors": 0, "deadline_exceeded": 0, "hedged": 0, "hedge_wins": 0}
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model,
+            "base_url": self.base_url,
+            "timeout_seconds": self.timeout,
+            "deadline_seconds": self.deadline,
+            "hedge_after_seconds": self.hedge_after,
+            **self._stats,
+            "latency": self.latency.snapshot(),
+        }
+
+routes = {
+    "chat": LLMRoute("chat", timeout=20, deadline=30),
+    "questions": LLMRoute("questions", timeout=30, deadline=45),
+    "summary": LLMRoute("summary", timeout=60, deadline=120),
+}
+
+def route_stats() -> dict:
+    return {name: route.stats() for name, route in routes.items()}
+
+@asynccontextmanager
+async def _completion(route, priority=INTERACTIVE, **kwargs):
+    """chat.completions.create on the route's endpoint through the scheduler, retrying 429s, timeouts and 5xx.
+
+    Yields the parsed response (a stream when stream=True) and holds the
+    scheduler slot until the block exits.
+    """
+    reserved = count_message_tokens(kwargs["messages"]) + LLM_COMPLETION_TOKENS_ESTIMATE
+    max_wait = LLM_INTERACTIVE_MAX_WAIT_SECONDS if priority == INTERACTIVE else None
+    for attempt in itertools.count():
+        await scheduler.acquire(reserved, priority, max_wait=max_wait)
+        try:
+            raw = await route.async_client.chat.completions.with_raw_response.create(
+                model=route.model, timeout=route.timeout, **kwargs
+            )
+            break
+        except asyncio.CancelledError:
+            scheduler.release(reserved)
+            raise
+        except Exception as e:
+            scheduler.release(reserved)
+            delay = scheduler.failed(e, attempt, max_wait=max_wait)
+            if delay is None:
+                if isinstance(e, RateLimitError):
+                    retry_after = _retry_after(e.response.headers) or max(
+                        scheduler.requests.blocked_until, scheduler.tokens.blocked_until
+                    ) - time.monotonic()
+                    raise LLMRateLimited(str(e), max(retry_after, 1)) from e
+                raise
+        await asyncio.sleep(delay)
+    used = None
+    response = None
+    try:
+        scheduler.observe(raw.headers)
+        response = raw.parse()
+        usage = getattr(response, "usage", None)
+        used = usage.total_tokens if usage else None
+        yield response
+    finally:
+        scheduler.release(reserved, used)
+        if kwargs.get("stream") and response is not None:
+            # Abandoned streams (hedge losers, disconnected clients) must not keep the connection
+            await response.close()
+
+async def _open_attempt(route, priority, kwargs):
+    """Run one attempt until it has output; returns (exit stack, response, first chunk or None)"""
+    stack = AsyncExitStack()
+    try:
+        response = await stack.enter_async_context(_completion(route, priority, **kwargs))
+        first = await anext(response, None) if kwargs.get("stream") else None
+        return stack, response, first
+    except BaseException:
+        await stack.aclose()
+        raise
+
+@asynccontextmanager
+async def _routed(route_name, priority=INTERACTIVE, **kwargs):
+    """_completion on a route, hedged as configured; yields (response, first chunk or None)"""
+    route = routes[route_name]
+    route._stats["calls"] += 1
+    started = time.monotonic()
+    attempts = [asyncio.create_task(_open_attempt(route, priority, kwargs))]
+    winner, error = None, None
+
+    async def first_success():
+        nonlocal winner, error
+        if route.hedge_after > 0:
+            done, _ = await asyncio.wait(attempts, timeout=route.hedge_after)
+            if not done:
+                route._stats["hedged"] += 1
+                attempts.append(asyncio.create_task(_open_attempt(route, priority, kwargs)))
+        pending = set(attempts)
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = winner or task
+                else:
+                    error = error or task.exception()
+
+    try:
+        await asyncio.wait_for(first_success(), route.deadline)
+    except asyncio.TimeoutError as e:
+        route._stats["deadline_exceeded"] += 1
+        error = asyncio.TimeoutError(f"{route.name} call exceeded its {route.deadline:g}s deadline")
+        error.__cause__ = e
+    finally:
+        losers = [task for task in attempts if task is not winner]
+        for task in losers:
+            task.cancel()
+        for result in await asyncio.gather(*losers, return_exceptions=True):
+            if isinstance(result, tuple):
+                await result[0].aclose()
+    if winner is None:
+        route._stats["errors"] += 1
+        raise error
+    route.latency.observe(time.monotonic() - started)
+    if winner is not attempts[0]:
+        route._stats["hedge_wins"] += 1
+    stack, response, first = winner.result()
+    async with stack:
+        yield response, first
+
+def _create(route_name, **kwargs):
+    """Sync path (scripts, benchmarks): same routes, retries and backoff, outside the async budgets"""
+    route = routes[route_name]
+    for attempt in itertools.count():
+        try:
+            return route.client.chat.completions.create(model=route.model, timeout=route.timeout, **kwargs)
+        except Exception as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                raise
+        time.sleep(delay)
+
+def _technical_questions_messages(tech_stack):
     prompt = (
         "You are an expert technical interviewer. Create 3-5 concise and relevant technical "
         "questions to assess a candidate's proficiency in the following technologies: "
         + ", ".join(tech_stack) +
         ". Include conceptual, practical, and problem-solving questions."
     )
-    messages = [
+    return [
         {"role": "system", "content": "You are a helpful, expert interviewer."},
         {"role": "user", "content": prompt}
     ]
-    response = client.chat.completions.create(
-        model=model_name,
-        messages=messages,
-        stream=False
-    )
-    content = response.choices[0].message.content.strip()
-    questions = [q.strip() for q in content.split("\n") if q.strip()]
+
+def _parse_questions(content):
+    questions = [q.strip() for q in content.strip().split("\n") if q.strip()]
     return questions[:5]
 
+def generate_technical_questions(tech_stack):
+    response = _create("questions", messages=_technical_questions_messages(tech_stack), stream=False)
+    return _parse_questions(response.choices[0].message.content)
+
 def chat_with_llm(messages):
     """Handle chat conversation with LLM"""
-    response = client.chat.completions.create(
-        model=model_name,
-        messages=messages,
-        stream=False
-    )
+    response = _create("chat", messages=messages, stream=False)
     return response.choices[0].message.content.strip()
+
+async def agenerate_technical_questions(tech_stack, priority=INTERACTIVE):
+    """Async variant of generate_technical_questions for use on the event loop"""
+    messages = _technical_questions_messages(tech_stack)
+    async with _routed("questions", priority, messages=messages, stream=False) as (response, _):
+        return _parse_questions(response.choices[0].message.content)
+
+async def achat_with_llm(messages, priority=INTERACTIVE, route="chat"):
+    """Async variant of chat_with_llm for use on the event loop"""
+    async with _routed(route, priority, messages=messages, stream=False) as (response, _):
+        return response.choices[0].message.content.strip()
+
+def _delta(chunk):
+    return chunk.choices[0].delta.content if chunk is not None and chunk.choices else None
+
+async def astream_chat_with_llm(messages, priority=INTERACTIVE, route="chat"):
+    """Yield reply text chunks as soon as the LLM emits them.
+
+    Failures before the first chunk are retried (and hedged) like any
+    other call; once text has been sent, errors propagate.
+    """
+    async with _routed(route, priority, messages=messages, stream=True) as (stream, first):
+        if _delta(first):
+            yield _delta(first)
+        async for chunk in stream:
+            delta = _delta(chunk)
+            if delta:
+                yield delta
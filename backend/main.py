@@ -1,17 +1,95 @@
+import asyncio
+import hashlib
+import json
+import os
 import uuid
-from fastapi import FastAPI, HTTPException, Body, UploadFile, File
+import weakref
+from fastapi import FastAPI, HTTPException, Body, UploadFile, File, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from tempfile import NamedTemporaryFile
+from fastapi.responses import StreamingResponse, JSONResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
+from typing import List, Optional
 from .sentiment_utils import analyze_sentiment
-from .models import CandidateInfo, TechQuestionsRequest, TechQuestionsResponse, CandidateSessionId
-from .llm_client import generate_technical_questions, chat_with_llm
-from .qdrant_client import create_collection, store_candidate
-from .session_utils import delete_session
-from .pdf_parser import extract_text_from_pdf, parse_resume_text
+from .models import (
+    CandidateInfo, CandidateSearchRequest, TechQuestionsRequest, TechQuestionsBatchRequest, TechQuestionsResponse,
+    CandidateSessionId,
+)
+from .llm_client import achat_with_llm, astream_chat_with_llm, scheduler as llm_scheduler, route_stats as llm_route_stats, LLMRateLimited, BACKGROUND, INTERACTIVE
+from .question_cache import get_technical_questions as get_cached_technical_questions, cache_stats, stack_key
+from . import question_bank
+from .candidate_store import (
+    init_store, aclose_store, store_status, StorageUnavailable,
+    astore_candidates, aget_candidate, asearch_candidates, candidate_point_id,
+)
+from .embeddings import embed_query
+from .session_utils import schedule_session_delete
+from .assessment import update_assessment, update_assessment_in_background, assessment_status
+from .jobs import job_queue, JobQueueFull
+from .admission import limiters, admission_stats, AdmissionRejected
+from .session_sweeper import start_sweeper, stop_sweeper, sweeper_stats
+from .conversation_store import get_history, append_messages, get_profile, save_profile, save_new_profiles
+from .prompt_builder import fit_to_budget, build_system_prompt, load_encoding
+from .parse_pool import parse_pdf_bytes, shutdown_pool, MAX_UPLOAD_BYTES
+from .parse_cache import content_hash, get_parsed, set_parsed, parse_cache_stats
+from .resume_ingest import ingest_resumes, is_zip, iter_zip_members
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Cap for one zip archive in /parse-resume/batch (each PDF inside is still capped)
+MAX_BATCH_UPLOAD_BYTES = int(os.getenv("MAX_BATCH_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+# Most candidates accepted by one /candidate-info/batch request
+CANDIDATE_BATCH_MAX_SIZE = int(os.getenv("CANDIDATE_BATCH_MAX_SIZE", "1000"))
+CANDIDATE_BATCH_MAX_BYTES = int(os.getenv("CANDIDATE_BATCH_MAX_BYTES", str(8 * 1024 * 1024)))
+# Cap for a whole /parse-resume/batch request body (all files together)
+MAX_BATCH_REQUEST_BYTES = int(os.getenv("MAX_BATCH_REQUEST_BYTES", str(256 * 1024 * 1024)))
+
+class UploadLimitMiddleware:
+    """Caps request bodies on upload routes before FastAPI parses (and spools) the form.
+
+    A declared Content-Length over the limit is answered with 413 without
+    reading the body; otherwise the body is counted as it streams in and
+    the request fails with 413 as soon as it passes the limit.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" and scope["method"] == "POST" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        detail = f"Upload exceeds the {limit / (1024 * 1024):.1f} MB request limit."
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            await JSONResponse(status_code=413, content={"detail": detail})(scope, receive, send)
+            return
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside form parsing; FastAPI passes HTTPException through
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
 
 app = FastAPI()
 
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits={
+        # Multipart framing adds a little overhead, so allow some slack
+        "/parse-resume": MAX_UPLOAD_BYTES + UPLOAD_CHUNK_BYTES,
+        "/parse-resume/batch": MAX_BATCH_REQUEST_BYTES,
+        "/candidate-info/batch": CANDIDATE_BATCH_MAX_BYTES,
+    },
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -23,20 +101,87 @@ app.add_middleware(
 class ChatRequest(BaseModel):
     session_id: str
     user_message: str
-    conversation_history: list  # List of past messages (user/assistant)
+    # The server owns the transcript for session_id. History sent here only
+    # seeds an empty transcript (e.g. the client-side opening question).
+    conversation_history: Optional[list] = None
+    # False for one-off prompts (e.g. summaries) that must not be recorded
+    persist: bool = True
+
+class FinalAnswerRequest(ChatRequest):
+    # Shown to the candidate instead of an LLM reply
+    closing_message: str = ""
 
 class ChatResponse(BaseModel):
     reply: str
 
 @app.on_event("startup")
 async def startup_event():
-    create_collection()
+    # Connect to storage in the background; / and /greet don't need it
+    asyncio.get_running_loop().run_in_executor(None, init_store)
+    # Same for the tokenizer: counts are approximate until it has loaded
+    asyncio.get_running_loop().run_in_executor(None, load_encoding)
+    start_sweeper()
+    job_queue.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_pool()
+    await job_queue.stop()
+    await stop_sweeper()
+    await aclose_store()
+
+@app.exception_handler(StorageUnavailable)
+async def storage_unavailable_handler(request: Request, exc: StorageUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+@app.exception_handler(JobQueueFull)
+async def job_queue_full_handler(request: Request, exc: JobQueueFull):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"})
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": str(exc.retry_after)})
+
+def release_with_stream(slot, stream):
+    """Release an admission slot when a streaming generator finishes.
+
+    The generator's own finally covers normal ends, errors and disconnects;
+    this also covers a generator that is dropped before it ever started.
+    """
+    weakref.finalize(stream, slot.release)
+    return stream
+
+def rate_limit_headers(exc: LLMRateLimited) -> dict:
+    return {"Retry-After": str(max(1, round(exc.retry_after or 1)))}
+
+@app.exception_handler(LLMRateLimited)
+async def llm_rate_limited_handler(request: Request, exc: LLMRateLimited):
+    return JSONResponse(status_code=429, content={"detail": "LLM provider rate limit reached, try again shortly."},
+                        headers=rate_limit_headers(exc))
+
+def storage_error(e: Exception) -> HTTPException:
+    status_code = 503 if isinstance(e, StorageUnavailable) else 500
+    return HTTPException(status_code=status_code, detail=str(e))
 
 @app.get("/")
 def root():
     return {"status": "ok", "service": "talentscout-backend"}
 
 
+@app.get("/metrics")
+def metrics():
+    return {
+        "question_cache": cache_stats(),
+        "question_bank": question_bank.bank_stats(),
+        "parse_cache": parse_cache_stats(),
+        "storage": store_status(),
+        "sessions": sweeper_stats(),
+        "jobs": job_queue.stats(),
+        "llm": llm_scheduler.stats(),
+        "llm_routes": llm_route_stats(),
+        "admission": admission_stats(),
+    }
+
 @app.get("/greet")
 def greet():
     return {
@@ -45,82 +190,366 @@ def greet():
     }
 
 @app.post("/candidate-info")
-def save_candidate(candidate: CandidateInfo):
+async def save_candidate(candidate: CandidateInfo):
     try:
         session_id = str(uuid.uuid4())
         candidate_dict = candidate.dict()
         candidate_dict["session_id"] = session_id
-        store_candidate(candidate_dict)
+        await astore_candidates([candidate_dict])
+        await asyncio.to_thread(save_profile, session_id, candidate.dict())
         return {
             "status": "success",
             "message": "Candidate info stored.",
             "session_id": session_id
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise storage_error(e)
+
+@app.post("/candidate-info/batch")
+async def save_candidates(candidates: List[CandidateInfo], wait: bool = True):
+    """Store many candidates in a few chunked upserts; session_ids follow input order"""
+    if len(candidates) > CANDIDATE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {CANDIDATE_BATCH_MAX_SIZE} candidates per batch (got {len(candidates)}).",
+        )
+    try:
+        candidate_dicts = []
+        for candidate in candidates:
+            candidate_dict = candidate.dict()
+            candidate_dict["session_id"] = str(uuid.uuid4())
+            candidate_dicts.append(candidate_dict)
+        async with limiters["candidate_batch"].admit():
+            stored = await astore_candidates(candidate_dicts, wait=wait)
+        profiles = {}
+        for candidate_dict in candidate_dicts:
+            profile = dict(candidate_dict)
+            profiles[profile.pop("session_id")] = profile
+        await asyncio.to_thread(save_new_profiles, profiles)
+        return {
+            "status": "success",
+            "message": f"{stored} candidates stored.",
+            "session_ids": [c["session_id"] for c in candidate_dicts]
+        }
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        raise storage_error(e)
+
+# Profile fields returned by search; contact details and session_id (which
+# authorises /chat, /summary and /clear-session) are never included
+SEARCH_RESULT_FIELDS = (
+    "full_name", "years_experience", "desired_position", "current_location", "tech_stack",
+    "education", "current_role", "linkedin", "github", "portfolio",
+)
+
+@app.post("/candidates/search")
+async def search(req: CandidateSearchRequest):
+    """Top-k similar candidates for a job description / skills, or like a stored candidate"""
+    if req.like_email:
+        # An unknown email looks the same as a search with no matches
+        if await aget_candidate(req.like_email) is None:
+            return {"results": []}
+        query = candidate_point_id(req.like_email)
+    else:
+        vector = embed_query(req.query or "", req.tech_stack)
+        if not vector.any():
+            raise HTTPException(status_code=400, detail="Provide a query, tech_stack or like_email to search by.")
+        query = vector.tolist()
+    async with limiters["candidate_search"].admit():
+        try:
+            hits = await asearch_candidates(
+                query,
+                limit=req.limit,
+                min_years_experience=req.min_years_experience,
+                max_years_experience=req.max_years_experience,
+                locations=req.locations,
+                exclude_email=req.like_email,
+            )
+        except Exception as e:
+            raise storage_error(e)
+    return {"results": [
+        {"score": round(score, 4), "candidate": {field: payload.get(field) for field in SEARCH_RESULT_FIELDS}}
+        for score, payload in hits
+    ]}
+
+async def questions_for_stack(tech_stack, priority=INTERACTIVE):
+    # Precomputed bank first; the LLM only sees stacks with no close entry
+    questions = question_bank.lookup(tech_stack)
+    if questions is None:
+        questions = await get_cached_technical_questions(tech_stack, priority=priority)
+    return questions
 
 @app.post("/tech-questions", response_model=TechQuestionsResponse)
-def get_technical_questions(req: TechQuestionsRequest):
-    questions = generate_technical_questions(req.tech_stack)
-    return TechQuestionsResponse(questions=questions)
+async def get_technical_questions(req: TechQuestionsRequest):
+    async with limiters["tech_questions"].admit():
+        return TechQuestionsResponse(questions=await questions_for_stack(req.tech_stack))
+
+async def tech_questions_batch_job(tech_stacks):
+    results = await asyncio.gather(
+        *[questions_for_stack(stack, priority=BACKGROUND) for stack in tech_stacks], return_exceptions=True
+    )
+    return [
+        {"tech_stack": stack, "error": str(result)} if isinstance(result, Exception)
+        else {"tech_stack": stack, "questions": result}
+        for stack, result in zip(tech_stacks, results)
+    ]
+
+job_queue.register("tech_questions_batch", tech_questions_batch_job)
+
+@app.post("/tech-questions/batch", status_code=202)
+async def submit_technical_questions_batch(req: TechQuestionsBatchRequest):
+    """Queue question generation for many stacks; poll GET /jobs/{job_id} for the result"""
+    key = "tech_questions:" + hashlib.sha256(
+        "\n".join(stack_key(stack) for stack in req.tech_stacks).encode("utf-8")
+    ).hexdigest()
+    job = job_queue.submit("tech_questions_batch", {"tech_stacks": req.tech_stacks}, key=key)
+    return {"job_id": job["id"], "status": job["status"]}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return job
+
+def upload_too_large():
+    return HTTPException(
+        status_code=413,
+        detail=f"Resume exceeds the {MAX_UPLOAD_BYTES / (1024 * 1024):.1f} MB upload limit."
+    )
+
+async def read_upload(file: UploadFile, limit: int = MAX_UPLOAD_BYTES) -> bytes:
+    """Read an upload into memory, failing as soon as it exceeds `limit` bytes"""
+    if file.size is not None and file.size > limit:
+        raise upload_too_large()
+    chunks = []
+    total = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        total += len(chunk)
+        if total > limit:
+            raise upload_too_large()
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 @app.post("/parse-resume")
 async def parse_resume(file: UploadFile = File(...)):
+    # Oversized bodies were already refused by UploadLimitMiddleware
+    async with limiters["parse_resume"].admit():
+        contents = await read_upload(file)
+        digest = content_hash(contents)
+        parsed_data = get_parsed(digest)
+        if parsed_data is not None:
+            return {"status": "success", "parsed_data": parsed_data, "sha256": digest}
+        try:
+            parsed_data = await parse_pdf_bytes(contents)
+            set_parsed(digest, parsed_data)
+            return {"status": "success", "parsed_data": parsed_data, "sha256": digest}
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Timed out parsing resume.")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to parse resume: {e}")
+
+@app.post("/parse-resume/batch")
+async def parse_resume_batch(files: List[UploadFile] = File(...), store: bool = True):
+    """Parse many resumes (PDFs and/or zips of PDFs), streaming NDJSON events.
+
+    One "result" line per file as it finishes, "batch" lines as candidates
+    are upserted, then a final "summary" line. Per-file errors are reported
+    inline and never abort the batch.
+    """
+    slot = await limiters["parse_resume_batch"].acquire()
     try:
-        # Create a temporary file that won't be auto-deleted
-        import tempfile
-        import os
-        
-        # Create temp file with proper suffix
-        temp_fd, temp_path = tempfile.mkstemp(suffix='.pdf')
-        
+        items = []
+        for upload in files:
+            name = upload.filename or "resume.pdf"
+            is_archive = name.lower().endswith(".zip") or upload.content_type in ("application/zip", "application/x-zip-compressed")
+            try:
+                data = await read_upload(upload, MAX_BATCH_UPLOAD_BYTES if is_archive else MAX_UPLOAD_BYTES)
+            except HTTPException as e:
+                items.append((name, ValueError(e.detail)))
+                continue
+            if is_zip(name, data):
+                items.extend(iter_zip_members(name, data, MAX_UPLOAD_BYTES))
+            else:
+                items.append((name, data))
+    except BaseException:
+        slot.release()
+        raise
+
+    async def event_stream():
         try:
-            # Write the uploaded file content to temp file
-            contents = await file.read()
-            with os.fdopen(temp_fd, 'wb') as tmp_file:
-                tmp_file.write(contents)
-            
-            # Now extract text from the saved temp file
-            text = extract_text_from_pdf(temp_path)
-            parsed_data = parse_resume_text(text)
-            
-            return {"status": "success", "parsed_data": parsed_data}
-            
+            async for event in ingest_resumes(items, store=store):
+                yield json.dumps(event) + "\n"
         finally:
-            # Clean up: remove the temporary file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
-                
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse resume: {e}")
+            slot.release()
 
-@app.post("/chat", response_model=ChatResponse)
-def chat_endpoint(req: ChatRequest):
-    try:
-        sentiment = analyze_sentiment(req.user_message)
+    return StreamingResponse(release_with_stream(slot, event_stream()), media_type="application/x-ndjson")
+
+@app.get("/parse-resume/{digest}")
+def get_parsed_resume(digest: str):
+    """Look up a previous parse by the PDF's SHA-256, so clients can skip re-uploading"""
+    parsed_data = get_parsed(digest.lower())
+    if parsed_data is None:
+        raise HTTPException(status_code=404, detail="No parse result for this file.")
+    return {"status": "success", "parsed_data": parsed_data, "sha256": digest.lower()}
+
+def sanitize_history(history):
+    """Keep only well-formed user/assistant/system messages"""
+    sanitized = []
+    for msg in history or []:
+        if isinstance(msg, dict):
+            role = msg.get("role")
+            content = msg.get("content")
+            if role in ("user", "assistant", "system") and isinstance(content, str) and content.strip():
+                sanitized.append({"role": role, "content": content})
+    return sanitized
+
+def load_history(req: ChatRequest):
+    if not req.persist:
+        return sanitize_history(req.conversation_history)
+    history = get_history(req.session_id)
+    if not history and req.conversation_history:
+        history = sanitize_history(req.conversation_history)
+        append_messages(req.session_id, history)
+    return history
+
+def _load_persisted_context(req: ChatRequest):
+    return load_history(req), get_profile(req.session_id)
+
+async def load_chat_context(req: ChatRequest):
+    """(history, profile) for a turn; transcript reads and writes run off the event loop"""
+    if not req.persist:
+        return load_history(req), None
+    return await asyncio.to_thread(_load_persisted_context, req)
+
+def build_chat_messages(req: ChatRequest, history: list, profile=None):
+    messages = [{"role": "system", "content": build_system_prompt(profile)}]
+    messages.extend(history)
+    messages.append({"role": "user", "content": req.user_message})
+    return fit_to_budget(messages)
+
+async def record_turn(req: ChatRequest, reply_text: str):
+    if req.persist:
+        await asyncio.to_thread(append_messages, req.session_id, [
+            {"role": "user", "content": req.user_message},
+            {"role": "assistant", "content": reply_text},
+        ])
 
-        # Build properly sanitized messages array
-        messages = [{"role": "system", "content": "You are a professional interviewer. Ask candidate questions based on context. Be polite and adaptive."}]
-        
-        # Safely process conversation history
-        for msg in req.conversation_history:
-            if isinstance(msg, dict):
-                role = msg.get("role")
-                content = msg.get("content")
-                if role in ("user", "assistant", "system") and isinstance(content, str) and content.strip():
-                    messages.append({"role": role, "content": content})
+def sse_event(data: dict, event: str = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
 
-        messages.append({"role": "user", "content": req.user_message})
+@app.post("/chat", response_model=ChatResponse)
+async def chat_endpoint(req: ChatRequest, background_tasks: BackgroundTasks):
+    async with limiters["chat"].admit():
+        return await run_chat_turn(req, background_tasks)
 
-        reply_text = chat_with_llm(messages)
+async def run_chat_turn(req: ChatRequest, background_tasks: BackgroundTasks):
+    try:
+        sentiment = analyze_sentiment(req.user_message)
+        messages = build_chat_messages(req, *await load_chat_context(req))
+        reply_text = await achat_with_llm(messages)
+        await record_turn(req, reply_text)
+        if req.persist:
+            background_tasks.add_task(update_assessment_in_background, req.session_id)
         return ChatResponse(reply=reply_text, sentiment=sentiment)
+    except LLMRateLimited as e:
+        raise HTTPException(status_code=429, detail="LLM provider rate limit reached, try again shortly.",
+                            headers=rate_limit_headers(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/chat/stream")
+async def chat_stream_endpoint(req: ChatRequest):
+    """Same as /chat, but forwards reply tokens as server-sent events.
 
-@app.post("/clear-session")
-def clear_session(session: CandidateSessionId = Body(...)):
-    if delete_session(session.session_id):
-        return {"status": "success", "message": "Session data cleared."}
-    else:
-        raise HTTPException(status_code=500, detail="Failed to clear session data.")
+    Emits one `data: {"token": ...}` event per chunk, then a final
+    `event: done` carrying the full reply and sentiment, or `event: error`.
+    """
+    # Held until the stream ends, so slow streams count against the chat limit
+    slot = await limiters["chat"].acquire()
+    try:
+        sentiment = analyze_sentiment(req.user_message)
+        messages = build_chat_messages(req, *await load_chat_context(req))
+    except BaseException:
+        slot.release()
+        raise
+
+    async def event_stream():
+        parts = []
+        try:
+            async for token in astream_chat_with_llm(messages):
+                parts.append(token)
+                yield sse_event({"token": token})
+        except LLMRateLimited as e:
+            yield sse_event({"detail": "LLM provider rate limit reached, try again shortly.",
+                             "retry_after": round(e.retry_after or 1)}, event="error")
+            return
+        except Exception as e:
+            yield sse_event({"detail": str(e)}, event="error")
+            return
+        finally:
+            slot.release()
+        reply_text = "".join(parts).strip()
+        await record_turn(req, reply_text)
+        yield sse_event({"reply": reply_text, "sentiment": sentiment}, event="done")
+
+    return StreamingResponse(
+        release_with_stream(slot, event_stream()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Runs after the stream ends; a no-op if the turn wasn't recorded
+        background=BackgroundTask(update_assessment_in_background, req.session_id) if req.persist else None,
+    )
+
+def _record_final_answer(req: FinalAnswerRequest, messages: list):
+    load_history(req)
+    append_messages(req.session_id, messages)
+
+@app.post("/chat/final", status_code=202)
+async def record_final_answer(req: FinalAnswerRequest):
+    """Record the candidate's last answer without asking the LLM for another question.
+
+    The answer then counts towards the assessment, so a following
+    /summary?refresh=true folds it in.
+    """
+    if not req.persist:
+        raise HTTPException(status_code=400, detail="Final answers are always recorded.")
+    messages = [{"role": "user", "content": req.user_message}]
+    if req.closing_message:
+        messages.append({"role": "assistant", "content": req.closing_message})
+    await asyncio.to_thread(_record_final_answer, req, messages)
+    return await asyncio.to_thread(assessment_status, req.session_id)
+
+async def assessment_job(session_id):
+    await update_assessment(session_id)
+    return await asyncio.to_thread(assessment_status, session_id)
+
+job_queue.register("assessment", assessment_job)
+
+@app.get("/summary/{session_id}")
+async def get_summary(session_id: str, refresh: bool = False):
+    """Latest rolling assessment for a session.
+
+    With refresh=true and answers not yet covered, a job folding them in
+    (one small delta call) is queued and returned as `job_id` with HTTP
+    202; poll GET /jobs/{job_id}, whose result is the refreshed summary.
+    """
+    status = await asyncio.to_thread(assessment_status, session_id)
+    if not status["total_turns"] and status["summary"] is None:
+        raise HTTPException(status_code=404, detail="No interview found for this session.")
+    if refresh and not status["up_to_date"]:
+        job = job_queue.submit(
+            "assessment",
+            {"session_id": session_id},
+            key=f"assessment:{session_id}:{status['total_turns']}",
+        )
+        return JSONResponse(status_code=202, content={**status, "job_id": job["id"], "job_status": job["status"]})
+    return status
+
+
+@app.post("/clear-session", status_code=202)
+async def clear_session(session: CandidateSessionId = Body(...)):
+    schedule_session_delete(session.session_id)
+    return {"status": "success", "message": "Session data scheduled for deletion."}
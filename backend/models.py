@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 
 class CandidateInfo(BaseModel):
@@ -15,9 +15,23 @@ class CandidateInfo(BaseModel):
     github: Optional[str] = None
     portfolio: Optional[str] = None
 
+class CandidateSearchRequest(BaseModel):
+    # Free text (e.g. a job description) and/or skills to match
+    query: Optional[str] = None
+    tech_stack: Optional[List[str]] = None
+    # Find candidates similar to this stored candidate instead
+    like_email: Optional[str] = None
+    min_years_experience: Optional[int] = None
+    max_years_experience: Optional[int] = None
+    locations: Optional[List[str]] = None
+    limit: int = Field(10, ge=1, le=100)
+
 class TechQuestionsRequest(BaseModel):
     tech_stack: List[str]
 
+class TechQuestionsBatchRequest(BaseModel):
+    tech_stacks: List[List[str]] = Field(..., min_length=1, max_length=100)
+
 class TechQuestionsResponse(BaseModel):
     questions: List[str]
 
@@ -0,0 +1,45 @@
+import hashlib
+import os
+from dotenv import load_dotenv
+from .cache_utils import LRUTTLCache, SqliteKV
+
+load_dotenv()
+
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "512"))
+# Optional SQLite file so parse results survive restarts (empty = disabled)
+PARSE_CACHE_DB_PATH = os.getenv("PARSE_CACHE_DB_PATH", "")
+
+_memory = LRUTTLCache(max_size=PARSE_CACHE_SIZE)
+_durable = SqliteKV(PARSE_CACHE_DB_PATH, table="parsed_resumes") if PARSE_CACHE_DB_PATH else None
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def get_parsed(digest: str):
+    """Cached parse result for a PDF's SHA-256 hex digest, or None"""
+    parsed = _memory.get(digest)
+    if parsed is not None:
+        _stats["hits"] += 1
+        return parsed
+    if _durable is not None:
+        parsed = _durable.get(digest)
+        if parsed is not None:
+            _stats["disk_hits"] += 1
+            _memory.set(digest, parsed)
+            return parsed
+    _stats["misses"] += 1
+    return None
+
+def set_parsed(digest: str, parsed: dict):
+    _memory.set(digest, parsed)
+    if _durable is not None:
+        _durable.set(digest, parsed)
+
+def parse_cache_stats() -> dict:
+    return {
+        **_stats,
+        "size": len(_memory),
+        "max_size": PARSE_CACHE_SIZE,
+        "persistent": _durable is not None,
+    }
@@ -0,0 +1,121 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dotenv import load_dotenv
+from .pdf_parser import (
+    parse_resume_bytes, parse_resume_pages, extract_page_range, count_pages, pages_to_read, iter_pdf_pages,
+    PARSE_PAGE_BUDGET,
+)
+from .skill_matcher import get_skill_matcher
+
+load_dotenv()
+
+# Uploads larger than this are rejected with 413 before parsing
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", "30"))
+# Documents with at least this many pages to read are extracted in page
+# ranges across the pool's workers (0 = always extract in one job)
+PARSE_PARALLEL_MIN_PAGES = int(os.getenv("PARSE_PARALLEL_MIN_PAGES", "40"))
+
+_pool = None
+
+class ParseTimeout(Exception):
+    pass
+
+def _alarm_handler(signum, frame):
+    raise ParseTimeout("Resume parsing timed out")
+
+def _with_alarm(timeout: float, func, *args):
+    """Runs inside a pool worker. SIGALRM frees the worker if a job overruns."""
+    previous = signal.signal(signal.SIGALRM, _alarm_handler)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+def _run_parse_job(data: bytes, timeout: float) -> dict:
+    return _with_alarm(timeout, parse_resume_bytes, data)
+
+def _count_or_parse(data: bytes, min_parallel_pages: int):
+    page_count = count_pages(data)
+    limit = pages_to_read(page_count)
+    if limit >= min_parallel_pages:
+        return None, page_count, limit
+    return parse_resume_pages(iter_pdf_pages(data, 0, limit), page_count), page_count, limit
+
+def _run_count_or_parse_job(data: bytes, min_parallel_pages: int, timeout: float):
+    """Count pages in the worker; small documents are parsed in the same job"""
+    return _with_alarm(timeout, _count_or_parse, data, min_parallel_pages)
+
+def _run_extract_range_job(data: bytes, start: int, stop: int, timeout: float) -> list:
+    return _with_alarm(timeout, extract_page_range, data, start, stop)
+
+def _run_parse_pages_job(pages: list, page_count: int, timeout: float) -> dict:
+    return _with_alarm(timeout, parse_resume_pages, pages, page_count)
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the server process has live threads and sockets
+        _pool = ProcessPoolExecutor(
+            max_workers=PARSE_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            # Build the skill automaton once per worker, not on its first job
+            initializer=get_skill_matcher,
+        )
+    return _pool
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+async def run_in_pool(func, *args, timeout: float = PARSE_TIMEOUT_SECONDS):
+    """Run a picklable CPU-bound function in the parse pool without blocking the event loop.
+
+    Raises asyncio.TimeoutError if the job does not finish within `timeout`
+    seconds (plus a small grace period for the worker-side alarm to fire).
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(get_pool(), func, *args),
+            timeout=timeout + 1,
+        )
+    except BrokenProcessPool:
+        # A worker died (e.g. a crash on a malformed PDF); start fresh next time
+        shutdown_pool()
+        raise
+
+async def _parse_parallel(data: bytes, page_count: int, limit: int, timeout: float) -> dict:
+    """Extract page ranges on several workers, then parse the joined pages in one job"""
+    chunk = -(-limit // PARSE_POOL_WORKERS)
+    ranges = [(start, min(start + chunk, limit)) for start in range(0, limit, chunk)]
+    chunks = await asyncio.gather(*[
+        run_in_pool(_run_extract_range_job, data, start, stop, timeout, timeout=timeout)
+        for start, stop in ranges
+    ])
+    pages = [text for texts in chunks for text in texts]
+    return await run_in_pool(_run_parse_pages_job, pages, page_count, timeout, timeout=timeout)
+
+async def parse_pdf_bytes(data: bytes, timeout: float = PARSE_TIMEOUT_SECONDS) -> dict:
+    try:
+        # A page budget below the threshold can never take the parallel path
+        if (PARSE_PARALLEL_MIN_PAGES > 0 and PARSE_POOL_WORKERS > 1
+                and (PARSE_PAGE_BUDGET <= 0 or PARSE_PAGE_BUDGET >= PARSE_PARALLEL_MIN_PAGES)):
+            parsed, page_count, limit = await run_in_pool(
+                _run_count_or_parse_job, data, PARSE_PARALLEL_MIN_PAGES, timeout, timeout=timeout
+            )
+            if parsed is not None:
+                return parsed
+            return await _parse_parallel(data, page_count, limit, timeout)
+        return await run_in_pool(_run_parse_job, data, timeout, timeout=timeout)
+    except ParseTimeout as e:
+        raise asyncio.TimeoutError(str(e)) from e
@@ -1,111 +1,185 @@
+import os
 import pymupdf as fitz
 import re
-from difflib import get_close_matches
+from dotenv import load_dotenv
+from .skill_matcher import get_skill_matcher
 
-def extract_text_from_pdf(file_path: str) -> str:
-    doc = fitz.open(file_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    doc.close()
-    return text
+load_dotenv()
 
-def parse_resume_text(text: str) -> dict:
-    """Enhanced resume parsing with skill validation"""
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    text_lower = text.lower()
-    
-    extracted = {
-        "name": "",
-        "email": "",
-        "phone": "",
-        "skills": [],
-        "experience": ""
-    }
-    
-    # Valid skills database for matching
-    valid_skills = [
-        'FastAPI', 'React', 'Next.js', 'Flask', 'MongoDB', 'Tailwind CSS', 
-        'Machine Learning', 'Python', 'JavaScript', 'HTML', 'CSS', 'Node.js',
-        'Docker', 'Kubernetes', 'AWS', 'Git', 'GitHub', 'TensorFlow', 'PyTorch',
-        'Streamlit', 'Qdrant', 'LangChain', 'Gemini API', 'OpenAI', 'Gradio',
-        'Pandas', 'NumPy', 'Scikit-learn', 'OpenCV', 'Django', 'Vue.js',
-        'Angular', 'TypeScript', 'PostgreSQL', 'MySQL', 'Redis', 'GraphQL',
-        'RESTful API', 'Microservices', 'CI/CD', 'Linux', 'Ubuntu', 'Nginx',
-        'Apache', 'Jenkins', 'Terraform', 'Ansible', 'Elasticsearch'
-    ]
-    
-    # Extract Email using regex
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text)
-    if email_match:
-        extracted["email"] = email_match.group()
-    
-    # Extract Phone using regex
-    phone_pattern = r'\b(?:\+91|91)?[6-9]\d{9}\b'
-    phone_match = re.search(phone_pattern, text)
-    if phone_match:
-        extracted["phone"] = phone_match.group()
-    
-    # Extract Name
-    for i, line in enumerate(lines[:10]):
-        skip_keywords = ['course', 'email', 'mobile', 'cgpa', 'academic', 'details']
-        if any(keyword in line.lower() for keyword in skip_keywords):
-            continue
-        
-        if re.match(r'^[A-Z][A-Z\s]+$', line) and len(line.split()) >= 2:
-            extracted["name"] = line.title()
-            break
-    
-    # Extract and clean skills
-    raw_skills = []
-    
-    # Look for explicit skill mentions
-    for skill in valid_skills:
-        if skill.lower() in text_lower:
-            raw_skills.append(skill)
-    
-    # Extract from common skill patterns
-    skill_patterns = [
+# Pages scanned for skills/experience (0 = whole document). Contact
+# details come from the first page that has them within this budget.
+PARSE_PAGE_BUDGET = int(os.getenv("PARSE_PAGE_BUDGET", "5"))
+MAX_SKILLS = 12
+
+# Valid skills database for matching
+VALID_SKILLS = [
+    'FastAPI', 'React', 'Next.js', 'Flask', 'MongoDB', 'Tailwind CSS', 
+    'Machine Learning', 'Python', 'JavaScript', 'HTML', 'CSS', 'Node.js',
+    'Docker', 'Kubernetes', 'AWS', 'Git', 'GitHub', 'TensorFlow', 'PyTorch',
+    'Streamlit', 'Qdrant', 'LangChain', 'Gemini API', 'OpenAI', 'Gradio',
+    'Pandas', 'NumPy', 'Scikit-learn', 'OpenCV', 'Django', 'Vue.js',
+    'Angular', 'TypeScript', 'PostgreSQL', 'MySQL', 'Redis', 'GraphQL',
+    'RESTful API', 'Microservices', 'CI/CD', 'Linux', 'Ubuntu', 'Nginx',
+    'Apache', 'Jenkins', 'Terraform', 'Ansible', 'Elasticsearch'
+]
+
+def open_pdf(source):
+    """Open a PDF from raw bytes (no temp file) or from a file path"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+def extract_text_from_pdf(source) -> str:
+    with open_pdf(source) as doc:
+        return "".join(page.get_text() for page in doc)
+
+def count_pages(source) -> int:
+    with open_pdf(source) as doc:
+        return doc.page_count
+
+def pages_to_read(page_count: int, page_budget: int = PARSE_PAGE_BUDGET) -> int:
+    return page_count if page_budget <= 0 else min(page_budget, page_count)
+
+def iter_pdf_pages(source, start: int = 0, stop: int = None):
+    """Lazily yield the text of pages start..stop-1, one page at a time"""
+    with open_pdf(source) as doc:
+        stop = doc.page_count if stop is None else min(stop, doc.page_count)
+        for page_number in range(start, stop):
+            yield doc.load_page(page_number).get_text()
+
+def extract_page_range(source, start: int, stop: int) -> list:
+    return list(iter_pdf_pages(source, start, stop))
+
+def parse_resume_bytes(data: bytes, page_budget: int = PARSE_PAGE_BUDGET) -> dict:
+    """Extract and parse a resume PDF held in memory, reading only the pages it needs"""
+    page_count = count_pages(data)
+    limit = pages_to_read(page_count, page_budget)
+    return parse_resume_pages(iter_pdf_pages(data, 0, limit), page_count)
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(?:\+91|91)?[6-9]\d{9}\b')
+NAME_SKIP_KEYWORDS = ['course', 'email', 'mobile', 'cgpa', 'academic', 'details']
+
+# Phrases that usually introduce a list of technologies
+SKILL_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in [
         r'built with (.*?)(?:\.|,|;|\n)',
         r'using (.*?)(?:\.|,|;|\n)',
         r'technologies?:?\s*(.*?)(?:\.|,|;|\n)',
         r'skills?:?\s*(.*?)(?:\.|,|;|\n)',
         r'stack:?\s*(.*?)(?:\.|,|;|\n)'
     ]
+]
+SKILL_DELIMITERS = re.compile(r'[,;&\s]+|\band\b')
+
+EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)\+?\s*years?\s*(?:of\s*)?experience'),
+    re.compile(r'experience\s*:?\s*(\d+)\+?\s*years?')
+]
+
+def extract_email(text: str) -> str:
+    match = EMAIL_PATTERN.search(text)
+    return match.group() if match else ""
+
+def extract_phone(text: str) -> str:
+    match = PHONE_PATTERN.search(text)
+    return match.group() if match else ""
+
+def extract_name(lines: list) -> str:
+    """First all-caps line of 2+ words near the top, skipping contact/academic lines"""
+    for line in lines[:10]:
+        if any(keyword in line.lower() for keyword in NAME_SKIP_KEYWORDS):
+            continue
+        if re.match(r'^[A-Z][A-Z\s]+$', line) and len(line.split()) >= 2:
+            return line.title()
+    return ""
+
+def _raw_skills(text: str) -> list:
+    """Skill mentions in text, in order and with duplicates"""
+    matcher = get_skill_matcher()
     
-    for pattern in skill_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
-        for match in matches:
+    # Look for explicit skill mentions (single pass over the text)
+    raw_skills = matcher.find_all(text)
+    
+    # Extract from common skill patterns
+    for pattern in SKILL_PATTERNS:
+        for match in pattern.findall(text):
             # Split by common delimiters
-            words = re.split(r'[,\.\sand\s&\s]+', match.strip())
-            for word in words:
+            for word in SKILL_DELIMITERS.split(match.strip()):
                 word = word.strip()
                 if len(word) > 2:
-                    # Try to match with valid skills using fuzzy matching
-                    close_matches = get_close_matches(word, valid_skills, n=1, cutoff=0.7)
-                    if close_matches:
-                        raw_skills.append(close_matches[0])
-    
-    # Remove duplicates and limit
-    extracted["skills"] = list(set(raw_skills))[:12]
-    
-    # Extract Experience
-    exp_patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-        r'experience\s*:?\s*(\d+)\+?\s*years?'
-    ]
-    
-    for pattern in exp_patterns:
-        match = re.search(pattern, text_lower)
+                    # Try to match with known skills using the n-gram index
+                    close_match = matcher.fuzzy_match(word)
+                    if close_match:
+                        raw_skills.append(close_match)
+    return raw_skills
+
+def extract_skills(text: str) -> list:
+    # Remove duplicates (keeping first-mention order) and limit
+    return list(dict.fromkeys(_raw_skills(text)))[:MAX_SKILLS]
+
+def _explicit_experience(text_lower: str):
+    for pattern in EXPERIENCE_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
-            extracted["experience"] = f"{match.group(1)} years"
-            break
+            return f"{match.group(1)} years"
+    return None
+
+def extract_experience(text_lower: str) -> str:
+    explicit = _explicit_experience(text_lower)
+    if explicit:
+        return explicit
     
-    if not extracted["experience"]:
-        if 'intern' in text_lower and 'b.tech' in text_lower:
-            extracted["experience"] = "0-1 years (Student/Intern)"
-        else:
-            extracted["experience"] = "Fresher"
+    if 'intern' in text_lower and 'b.tech' in text_lower:
+        return "0-1 years (Student/Intern)"
+    return "Fresher"
+
+def parse_resume_text(text: str) -> dict:
+    """Enhanced resume parsing with skill validation"""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    text_lower = text.lower()
     
+    return {
+        "name": extract_name(lines),
+        "email": extract_email(text),
+        "phone": extract_phone(text),
+        "skills": extract_skills(text),
+        "experience": extract_experience(text_lower)
+    }
+
+def parse_resume_pages(pages, page_count: int = None) -> dict:
+    """Parse a resume page by page.
+
+    `pages` may be a lazy iterator; it is consumed only until the result is
+    settled: contact fields come from the first page that has them, and
+    reading stops early once MAX_SKILLS skills and an explicit experience
+    statement have been found. `pages_read` lists the 1-based pages used.
+    """
+    extracted = {"name": "", "email": "", "phone": "", "skills": [], "experience": ""}
+    skills = {}
+    experience = None
+    lower_pages = []
+    pages_read = []
+
+    for page_number, text in enumerate(pages, start=1):
+        pages_read.append(page_number)
+        text_lower = text.lower()
+        lower_pages.append(text_lower)
+        # Only the top of the document holds the name; later pages start with section headings
+        if page_number == 1:
+            extracted["name"] = extract_name([line.strip() for line in text.split('\n') if line.strip()])
+        if not extracted["email"]:
+            extracted["email"] = extract_email(text)
+        if not extracted["phone"]:
+            extracted["phone"] = extract_phone(text)
+        for skill in _raw_skills(text):
+            skills.setdefault(skill, None)
+        experience = experience or _explicit_experience(text_lower)
+        if len(skills) >= MAX_SKILLS and experience:
+            break
+
+    extracted["skills"] = list(skills)[:MAX_SKILLS]
+    extracted["experience"] = experience or extract_experience("\n".join(lower_pages))
+    extracted["pages_read"] = pages_read
+    extracted["page_count"] = page_count if page_count is not None else len(pages_read)
     return extracted
@@ -0,0 +1,165 @@
+import argparse
+import logging
+import math
+import os
+import re
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Max prompt tokens sent per /chat call (system prompt + history + new turn)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+# Share of the budget the condensed note for dropped turns may use
+CONDENSED_HISTORY_SHARE = float(os.getenv("CONDENSED_HISTORY_SHARE", "0.15"))
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+# tiktoken reads its BPE file from here; fill it at build time with
+# `python -m backend.prompt_builder fetch-encoding` so servers never download it
+TIKTOKEN_CACHE_DIR = os.environ.setdefault(
+    "TIKTOKEN_CACHE_DIR", os.path.join(os.path.dirname(__file__), "data", "tiktoken")
+)
+
+# Chat formats add a few tokens of framing per message
+MESSAGE_OVERHEAD_TOKENS = 4
+CONDENSED_SNIPPET_WORDS = 25
+
+INTERVIEWER_SYSTEM_PROMPT = "You are a professional interviewer. Ask candidate questions based on context. Be polite and adaptive."
+
+INTERVIEW_GUIDELINES = (
+    "Guidelines:\n"
+    "- Ask one focused question at a time\n"
+    "- Make questions progressively more technical\n"
+    "- Ask follow-up questions based on their responses\n"
+    "- Keep questions relevant to their stated tech stack\n"
+    "- Be professional but conversational"
+)
+
+_encoding = None
+
+def load_encoding():
+    """Load the tiktoken encoding; blocking (may download), so run it off the event loop.
+
+    Token counts are approximate until this has succeeded.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+        except Exception as e:
+            print(f"tiktoken unavailable ({e}); using approximate token counts.")
+    return _encoding
+
+def candidate_info_lines(profile: dict) -> str:
+    """Bullet list of the profile fields the LLM needs, in a fixed order"""
+    fields = [
+        ("Name", profile.get("full_name")),
+        ("Experience", f"{profile.get('years_experience', 0)} years"),
+        ("Position", profile.get("desired_position")),
+        ("Tech Stack", ", ".join(profile.get("tech_stack") or [])),
+        ("Current Role", profile.get("current_role")),
+        ("Education", profile.get("education")),
+    ]
+    return "\n".join(f"- {label}: {value}" for label, value in fields if value)
+
+def build_system_prompt(profile: dict = None) -> str:
+    """Build the per-session system prompt from a stored CandidateInfo dict.
+
+    The output depends only on the profile, so every turn of a session sends
+    a byte-identical prefix that provider-side prompt caching can reuse.
+    """
+    if not profile:
+        return INTERVIEWER_SYSTEM_PROMPT
+    candidate_lines = candidate_info_lines(profile)
+    return (
+        "You are conducting a professional technical interview. "
+        "Be polite and adaptive.\n"
+        f"Candidate Info:\n{candidate_lines}\n"
+        f"{INTERVIEW_GUIDELINES}"
+    )
+
+def count_tokens(text: str) -> int:
+    # Never loads the encoding itself: this runs on the request path
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # Approximation: one token per punctuation mark, ~4 characters per word piece
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in re.findall(r"\w+|[^\w\s]", text))
+
+def count_message_tokens(messages: list) -> int:
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+def _snippet(text: str) -> str:
+    words = text.split()
+    if len(words) <= CONDENSED_SNIPPET_WORDS:
+        return " ".join(words)
+    return " ".join(words[:CONDENSED_SNIPPET_WORDS]) + " ..."
+
+def _condense(dropped: list, budget: int):
+    """Collapse dropped turns into one system note, newest snippets first, within budget"""
+    header = "Earlier in the interview (condensed):"
+    used = count_tokens(header) + MESSAGE_OVERHEAD_TOKENS
+    if used > budget:
+        return None
+    lines = []
+    for msg in reversed(dropped):
+        speaker = "Candidate" if msg["role"] == "user" else "Interviewer"
+        line = f"- {speaker}: {_snippet(msg['content'])}"
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            break
+        lines.append(line)
+        used += cost
+    lines.reverse()
+    omitted = len(dropped) - len(lines)
+    if omitted:
+        lines.insert(0, f"- ({omitted} earlier messages omitted)")
+    return {"role": "system", "content": "\n".join([header] + lines)}
+
+def fit_to_budget(messages: list, budget: int = PROMPT_TOKEN_BUDGET):
+    """Trim a chat prompt to `budget` tokens.
+
+    Leading system messages (system prompt, candidate profile) and the final
+    message (the new turn) are always kept. History in between is kept
+    newest-first while it fits; older turns are collapsed into a short
+    condensed note, or dropped if even that does not fit.
+    """
+    before = count_message_tokens(messages)
+    if len(messages) <= 1 or before <= budget:
+        return messages
+
+    head_len = 0
+    while head_len < len(messages) - 1 and messages[head_len]["role"] == "system":
+        head_len += 1
+    head, history, last = messages[:head_len], messages[head_len:-1], messages[-1]
+
+    remaining = budget - count_message_tokens(head + [last])
+    note_budget = int(budget * CONDENSED_HISTORY_SHARE)
+    kept = []
+    for msg in reversed(history):
+        cost = count_message_tokens([msg])
+        if cost > remaining - note_budget:
+            break
+        kept.append(msg)
+        remaining -= cost
+    kept.reverse()
+
+    dropped = history[:len(history) - len(kept)]
+    note = _condense(dropped, min(note_budget, remaining)) if dropped else None
+    fitted = head + ([note] if note else []) + kept + [last]
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Prompt trimmed from %d to %d tokens (budget %d, %d turns dropped)",
+                     before, count_message_tokens(fitted), budget, len(dropped))
+    return fitted
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt builder utilities")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("fetch-encoding", help=f"Download the {TOKENIZER_ENCODING} BPE file into TIKTOKEN_CACHE_DIR")
+    parser.parse_args()
+    if load_encoding() is None:
+        raise SystemExit(1)
+    print(f"{TOKENIZER_ENCODING} cached in {TIKTOKEN_CACHE_DIR}")
+
+if __name__ == "__main__":
+    main()
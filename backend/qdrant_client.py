@@ -1,7 +1,17 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, PayloadSchemaType
+import argparse
+import asyncio
+import contextlib
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.models import (
+    VectorParams, Distance, PayloadSchemaType, PointStruct, Filter, FieldCondition, MatchAny,
+    Range, HasIdCondition, FilterSelector,
+)
 from dotenv import load_dotenv
+from .candidate_store import CandidateStore, candidate_point_id, candidate_points, normalize_email, get_store
+from .embeddings import EMBEDDING_DIM
 
 load_dotenv()
 
@@ -10,70 +20,338 @@ QDRANT_HOST = os.getenv(
     "https://9485db48-8672-469a-a917-41a4ebbfd533.us-east4-0.gcp.cloud.qdrant.io"
 )
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+# gRPC (port 6334) is cheaper per call than REST for many small writes
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+# Connections per client, shared by all requests (empty = library default)
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "0")) or None
 
 COLLECTION_NAME = "TalentScout"
+VECTOR_SIZE = EMBEDDING_DIM
+# Points per upsert request and concurrent requests for bulk writes
+QDRANT_UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+QDRANT_UPSERT_PARALLELISM = int(os.getenv("QDRANT_UPSERT_PARALLELISM", "1"))
 
-qdrant_client = QdrantClient(
-    url=QDRANT_HOST,
-    api_key=QDRANT_API_KEY,
-    prefer_grpc=False,
-    timeout=30,
-    check_compatibility=False,
-)
+PAYLOAD_INDEXES = {
+    "session_id": PayloadSchemaType.KEYWORD,
+    "email": PayloadSchemaType.KEYWORD,
+    "years_experience": PayloadSchemaType.INTEGER,
+    "current_location": PayloadSchemaType.KEYWORD,
+    "expires_at": PayloadSchemaType.INTEGER,
+}
 
-def create_collection():
-    collections = [col.name for col in qdrant_client.get_collections().collections]
-    if COLLECTION_NAME not in collections:
-        qdrant_client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=VectorParams(size=128, distance=Distance.COSINE),
-        )
-    # Create payload indexes for filtering
-    for field in ["session_id", "email"]:
-        try:
-            qdrant_client.create_payload_index(
-                collection_name=COLLECTION_NAME,
-                field_name=field,
-                field_schema=PayloadSchemaType.KEYWORD,
-            )
-        except Exception as e:
-            if "already exists" in str(e).lower():
-                pass
-            else:
-                print(f"Error creating index for {field}: {e}")
-
-def store_candidate(candidate_dict):
-    dummy_vector = [float(hash(candidate_dict.get("full_name", "")) % 1) for _ in range(128)]
-    qdrant_client.upsert(
-        collection_name=COLLECTION_NAME,
-        points=[
-            {
-                "id": hash(candidate_dict.get("email", "")) % (10 ** 8),
-                "payload": candidate_dict,
-                "vector": dummy_vector
-            }
-        ]
-    )
+def _remote_kwargs(url=None, prefer_grpc=None, api_key=None):
+    """Client settings from the environment; an explicit url (e.g. benchmarks) comes with its own api_key"""
+    return {
+        "url": url or QDRANT_HOST,
+        "api_key": api_key if url else QDRANT_API_KEY,
+        "prefer_grpc": QDRANT_PREFER_GRPC if prefer_grpc is None else prefer_grpc,
+        "grpc_port": QDRANT_GRPC_PORT,
+        "pool_size": QDRANT_POOL_SIZE,
+        "timeout": 30,
+        "check_compatibility": False,
+    }
+
+def remote_client(url=None, prefer_grpc=None, api_key=None) -> QdrantClient:
+    return QdrantClient(**_remote_kwargs(url, prefer_grpc, api_key))
+
+def remote_async_client(url=None, prefer_grpc=None, api_key=None) -> AsyncQdrantClient:
+    return AsyncQdrantClient(**_remote_kwargs(url, prefer_grpc, api_key))
+
+def local_client(path: str = ":memory:") -> QdrantClient:
+    """In-process Qdrant: in memory, or persisted under a directory"""
+    if path == ":memory:":
+        return QdrantClient(location=":memory:")
+    return QdrantClient(path=path)
 
-def delete_session_data(session_id: str) -> bool:
-    from qdrant_client.models import Filter, FieldCondition, MatchValue, FilterSelector
+def _point_structs(points):
+    return [PointStruct(id=point_id, payload=payload, vector=vector) for point_id, payload, vector in points]
 
+def _search_filter(min_years_experience=None, max_years_experience=None, locations=None, exclude_id=None):
+    must, must_not = [], []
+    if min_years_experience is not None or max_years_experience is not None:
+        must.append(FieldCondition(
+            key="years_experience",
+            range=Range(gte=min_years_experience, lte=max_years_experience),
+        ))
+    if locations:
+        must.append(FieldCondition(key="current_location", match=MatchAny(any=list(locations))))
+    if exclude_id:
+        must_not.append(HasIdCondition(has_id=[exclude_id]))
+    return Filter(must=must, must_not=must_not) if must or must_not else None
+
+def _session_selector(session_ids):
     session_filter_condition = Filter(
         must=[
             FieldCondition(
                 key="session_id",
-                match=MatchValue(value=session_id)
+                match=MatchAny(any=list(session_ids))
             )
         ]
     )
+    return FilterSelector(filter=session_filter_condition)
+
+def _expired_filter(now):
+    return Filter(must=[FieldCondition(key="expires_at", range=Range(lt=now))])
+
+class QdrantCandidateStore(CandidateStore):
+    def __init__(self, client: QdrantClient, serialize: bool = False, async_client_factory=None):
+        """serialize=True funnels calls through one lock (needed for the in-process engine).
+
+        With async_client_factory, the async methods use one AsyncQdrantClient
+        (created on first use and shared by all requests) instead of running
+        the sync client in a thread.
+        """
+        self.client = client
+        self.local = serialize
+        self._lock = threading.Lock() if serialize else contextlib.nullcontext()
+        self._async_client_factory = async_client_factory
+        self._async_client = None
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            self._async_client = self._async_client_factory()
+        return self._async_client
+
+    def setup(self):
+        with self._lock:
+            collections = [col.name for col in self.client.get_collections().collections]
+            if COLLECTION_NAME not in collections:
+                self.client.create_collection(
+                    collection_name=COLLECTION_NAME,
+                    vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.COSINE),
+                )
+            if self.local:
+                # Payload indexes are a no-op in the in-process engine
+                return
+            # Create payload indexes for filtering
+            for field, schema in PAYLOAD_INDEXES.items():
+                try:
+                    self.client.create_payload_index(
+                        collection_name=COLLECTION_NAME,
+                        field_name=field,
+                        field_schema=schema,
+                    )
+                except Exception as e:
+                    if "already exists" in str(e).lower():
+                        pass
+                    else:
+                        print(f"Error creating index for {field}: {e}")
+
+    def _chunks(self, points, batch_size):
+        batch_size = batch_size or QDRANT_UPSERT_BATCH_SIZE
+        structs = _point_structs(points)
+        return [structs[i:i + batch_size] for i in range(0, len(structs), batch_size)]
+
+    def _parallelism(self, parallelism):
+        return 1 if self.local else parallelism or QDRANT_UPSERT_PARALLELISM
+
+    def _upsert_chunk(self, points, wait):
+        with self._lock:
+            self.client.upsert(collection_name=COLLECTION_NAME, points=points, wait=wait)
+
+    def upsert(self, points, wait=True, batch_size=None, parallelism=None):
+        """Upsert in chunks of batch_size points.
+
+        Sequentially, only the last chunk is sent with `wait`: Qdrant applies
+        a collection's updates in order, so once it is acknowledged the
+        earlier chunks are too. In parallel there is no ordering, so every
+        chunk uses `wait`. With wait=False the call returns once Qdrant has
+        accepted the points, before they are indexed.
+        """
+        chunks = self._chunks(points, batch_size)
+        parallelism = self._parallelism(parallelism)
+        if parallelism > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(parallelism, len(chunks))) as executor:
+                # list() re-raises the first failed chunk
+                list(executor.map(lambda chunk: self._upsert_chunk(chunk, wait), chunks))
+        else:
+            for i, chunk in enumerate(chunks):
+                self._upsert_chunk(chunk, wait if i == len(chunks) - 1 else False)
+
+    async def aupsert(self, points, wait=True, batch_size=None, parallelism=None):
+        """Async upsert with the same chunking and wait semantics as upsert"""
+        if self._async_client_factory is None:
+            return await super().aupsert(points, wait)
+        client = self._get_async_client()
+        chunks = self._chunks(points, batch_size)
+        parallelism = self._parallelism(parallelism)
+        if parallelism > 1 and len(chunks) > 1:
+            semaphore = asyncio.Semaphore(parallelism)
+
+            async def send(chunk):
+                async with semaphore:
+                    await client.upsert(collection_name=COLLECTION_NAME, points=chunk, wait=wait)
+
+            await asyncio.gather(*[send(chunk) for chunk in chunks])
+        else:
+            for i, chunk in enumerate(chunks):
+                await client.upsert(
+                    collection_name=COLLECTION_NAME,
+                    points=chunk,
+                    wait=wait if i == len(chunks) - 1 else False,
+                )
+
+    def retrieve(self, point_id):
+        with self._lock:
+            points = self.client.retrieve(
+                collection_name=COLLECTION_NAME,
+                ids=[point_id],
+                with_payload=True,
+                with_vectors=False,
+            )
+        return points[0].payload if points else None
+
+    async def aretrieve(self, point_id):
+        if self._async_client_factory is None:
+            return await super().aretrieve(point_id)
+        points = await self._get_async_client().retrieve(
+            collection_name=COLLECTION_NAME,
+            ids=[point_id],
+            with_payload=True,
+            with_vectors=False,
+        )
+        return points[0].payload if points else None
+
+    def search(self, query, limit=10, **filters):
+        with self._lock:
+            result = self.client.query_points(
+                collection_name=COLLECTION_NAME,
+                query=query,
+                query_filter=_search_filter(**filters),
+                limit=limit,
+                with_payload=True,
+                with_vectors=False,
+            )
+        return [(point.score, point.payload) for point in result.points]
 
-    try:
-        qdrant_client.delete(
+    async def asearch(self, query, limit=10, **filters):
+        if self._async_client_factory is None:
+            return await super().asearch(query, limit=limit, **filters)
+        result = await self._get_async_client().query_points(
             collection_name=COLLECTION_NAME,
-            points_selector=FilterSelector(filter=session_filter_condition)
+            query=query,
+            query_filter=_search_filter(**filters),
+            limit=limit,
+            with_payload=True,
+            with_vectors=False,
         )
-        print(f"Deleted all points with session_id={session_id} from {COLLECTION_NAME}.")
-        return True
-    except Exception as e:
-        print(f"Error deleting session data for session_id={session_id}: {e}")
-        return False
+        return [(point.score, point.payload) for point in result.points]
+
+    def delete_sessions(self, session_ids):
+        with self._lock:
+            self.client.delete(
+                collection_name=COLLECTION_NAME,
+                points_selector=_session_selector(session_ids)
+            )
+
+    async def adelete_sessions(self, session_ids):
+        if self._async_client_factory is None:
+            return await super().adelete_sessions(session_ids)
+        await self._get_async_client().delete(
+            collection_name=COLLECTION_NAME,
+            points_selector=_session_selector(session_ids)
+        )
+
+    def delete_expired(self, now, limit):
+        # Bounded batch: look up at most `limit` expired IDs, then delete those
+        with self._lock:
+            points, _ = self.client.scroll(
+                collection_name=COLLECTION_NAME,
+                scroll_filter=_expired_filter(now),
+                limit=limit,
+                with_payload=False,
+                with_vectors=False,
+            )
+            if points:
+                self.client.delete(collection_name=COLLECTION_NAME, points_selector=[p.id for p in points])
+        return len(points)
+
+    async def adelete_expired(self, now, limit):
+        if self._async_client_factory is None:
+            return await super().adelete_expired(now, limit)
+        client = self._get_async_client()
+        points, _ = await client.scroll(
+            collection_name=COLLECTION_NAME,
+            scroll_filter=_expired_filter(now),
+            limit=limit,
+            with_payload=False,
+            with_vectors=False,
+        )
+        if points:
+            await client.delete(collection_name=COLLECTION_NAME, points_selector=[p.id for p in points])
+        return len(points)
+
+    def close(self):
+        self.client.close()
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+
+    def dedupe(self, dry_run=False, page_size=1000):
+        """Collapse points left by the old hash(email) IDs onto deterministic IDs.
+
+        For each email the point already at the deterministic ID wins,
+        otherwise the last one scrolled (re-embedded); every other point for
+        that email is deleted. Points without an email are left alone.
+        Returns counts.
+        """
+        groups = {}
+        offset = None
+        scanned = 0
+        while True:
+            with self._lock:
+                points, offset = self.client.scroll(
+                    collection_name=COLLECTION_NAME,
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            for point in points:
+                scanned += 1
+                email = normalize_email((point.payload or {}).get("email"))
+                if email:
+                    groups.setdefault(email, []).append(point)
+            if offset is None:
+                break
+
+        moved, deleted = 0, 0
+        for email, points in groups.items():
+            target_id = candidate_point_id(email)
+            keep = next((p for p in points if str(p.id) == target_id), points[-1])
+            stale = [p.id for p in points if str(p.id) != target_id]
+            if not stale:
+                continue
+            if str(keep.id) != target_id:
+                moved += 1
+                if not dry_run:
+                    self.upsert(candidate_points([keep.payload]))
+            deleted += len(stale)
+            if not dry_run:
+                with self._lock:
+                    self.client.delete(collection_name=COLLECTION_NAME, points_selector=stale)
+        return {"scanned": scanned, "emails": len(groups), "moved": moved, "deleted": deleted}
+
+def main():
+    parser = argparse.ArgumentParser(description="Candidate collection maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+    dedupe = sub.add_parser("dedupe", help="Collapse duplicate candidates onto deterministic point IDs")
+    dedupe.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args()
+
+    if args.command == "dedupe":
+        store = get_store()
+        # Not isinstance: under -m this module is __main__, not the copy the store came from
+        if not hasattr(store, "dedupe"):
+            print("dedupe only applies to the Qdrant backends; nothing to do.")
+            return
+        result = store.dedupe(dry_run=args.dry_run)
+        moved, deleted = ("would move", "would delete") if args.dry_run else ("moved", "deleted")
+        print(f"Scanned {result['scanned']} points for {result['emails']} emails; "
+              f"{moved} {result['moved']} to deterministic IDs, {deleted} {result['deleted']} duplicates.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Precomputed technical questions for common tech-stack combinations.
+
+Build the bank offline (one LLM call per combination, resumable):
+
+    python -m backend.question_bank build --max-size 2 --concurrency 8
+
+At request time `lookup` maps a stack to the most similar precomputed
+entry (Jaccard similarity over normalized skills) without calling the LLM.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from itertools import combinations
+from dotenv import load_dotenv
+from .question_cache import normalize_stack
+
+load_dotenv()
+
+QUESTION_BANK_PATH = os.getenv(
+    "QUESTION_BANK_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "question_bank.json"),
+)
+QUESTION_BANK_MIN_SIMILARITY = float(os.getenv("QUESTION_BANK_MIN_SIMILARITY", "0.6"))
+
+class QuestionBank:
+    """In-memory question bank with an inverted skill -> entry index.
+
+    On disk the bank is stored compactly: a sorted skill vocabulary plus
+    entries that reference skills by vocabulary index.
+    """
+
+    def __init__(self, entries=None):
+        self.stacks = []
+        self.questions = []
+        self._index = {}
+        for stack, questions in entries or []:
+            self.add(stack, questions)
+
+    def __len__(self):
+        return len(self.stacks)
+
+    def add(self, tech_stack, questions):
+        skills = frozenset(normalize_stack(tech_stack))
+        if not skills:
+            return
+        entry_id = len(self.stacks)
+        self.stacks.append(skills)
+        self.questions.append(list(questions))
+        for skill in skills:
+            self._index.setdefault(skill, []).append(entry_id)
+
+    def nearest(self, tech_stack):
+        """Return (entry_id, jaccard_similarity) of the closest entry, or (None, 0.0)"""
+        query = set(normalize_stack(tech_stack))
+        overlap = Counter()
+        for skill in query:
+            overlap.update(self._index.get(skill, ()))
+        best_id, best_score = None, 0.0
+        for entry_id, shared in overlap.items():
+            score = shared / (len(query) + len(self.stacks[entry_id]) - shared)
+            if score > best_score:
+                best_id, best_score = entry_id, score
+        return best_id, best_score
+
+    def lookup(self, tech_stack, min_similarity=QUESTION_BANK_MIN_SIMILARITY):
+        """Questions of the nearest entry if it is similar enough, else None"""
+        entry_id, score = self.nearest(tech_stack)
+        if entry_id is None or score < min_similarity:
+            return None
+        return list(self.questions[entry_id])
+
+    def to_dict(self):
+        vocab = sorted(self._index)
+        position = {skill: i for i, skill in enumerate(vocab)}
+        return {
+            "version": 1,
+            "skills": vocab,
+            "entries": [
+                [sorted(position[s] for s in stack), questions]
+                for stack, questions in zip(self.stacks, self.questions)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        vocab = data["skills"]
+        return cls(([vocab[i] for i in ids], questions) for ids, questions in data["entries"])
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+def _load_default_bank():
+    if not os.path.exists(QUESTION_BANK_PATH):
+        return QuestionBank()
+    try:
+        bank = QuestionBank.load(QUESTION_BANK_PATH)
+        print(f"Loaded {len(bank)} question bank entries from {QUESTION_BANK_PATH}")
+        return bank
+    except Exception as e:
+        print(f"Error loading question bank from {QUESTION_BANK_PATH}: {e}")
+        return QuestionBank()
+
+question_bank = _load_default_bank()
+_stats = {"hits": 0, "misses": 0}
+
+def lookup(tech_stack):
+    """Precomputed questions for the closest known stack, or None"""
+    questions = question_bank.lookup(tech_stack) if len(question_bank) else None
+    _stats["hits" if questions is not None else "misses"] += 1
+    return questions
+
+def bank_stats() -> dict:
+    return {**_stats, "entries": len(question_bank), "min_similarity": QUESTION_BANK_MIN_SIMILARITY}
+
+async def build_bank(skills, max_size, out_path, concurrency=8, save_every=50):
+    """Generate questions for every combination of up to max_size skills.
+
+    Combinations already present in out_path are skipped, so an interrupted
+    build can be resumed.
+    """
+    from .llm_client import agenerate_technical_questions, BACKGROUND
+
+    bank = QuestionBank.load(out_path) if os.path.exists(out_path) else QuestionBank()
+    done = set(bank.stacks)
+    todo = [
+        list(combo)
+        for size in range(1, max_size + 1)
+        for combo in combinations(skills, size)
+        if frozenset(normalize_stack(combo)) not in done
+    ]
+    print(f"{len(done)} entries present, generating {len(todo)} more")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    completed = 0
+    start = time.perf_counter()
+
+    async def generate(stack):
+        nonlocal completed
+        async with semaphore:
+            try:
+                questions = await agenerate_technical_questions(stack, priority=BACKGROUND)
+            except Exception as e:
+                print(f"Failed for {stack}: {e}")
+                return
+        bank.add(stack, questions)
+        completed += 1
+        if completed % save_every == 0:
+            bank.save(out_path)
+            print(f"{completed}/{len(todo)} done ({time.perf_counter() - start:.1f}s)")
+
+    await asyncio.gather(*[generate(stack) for stack in todo])
+    bank.save(out_path)
+    print(f"Saved {len(bank)} entries to {out_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Technical question bank tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Pre-generate questions for common skill combinations")
+    build.add_argument("--out", default=QUESTION_BANK_PATH)
+    build.add_argument("--max-size", type=int, default=2, help="Largest combination size")
+    build.add_argument("--concurrency", type=int, default=8)
+    build.add_argument("--skills", help="Comma-separated skills (default: pdf_parser.VALID_SKILLS)")
+
+    query = sub.add_parser("lookup", help="Show the nearest entry for a stack")
+    query.add_argument("stack", help="Comma-separated tech stack")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        if args.skills:
+            skills = [s.strip() for s in args.skills.split(",") if s.strip()]
+        else:
+            from .pdf_parser import VALID_SKILLS
+            skills = VALID_SKILLS
+        asyncio.run(build_bank(skills, args.max_size, args.out, args.concurrency))
+    else:
+        stack = [s.strip() for s in args.stack.split(",")]
+        entry_id, score = question_bank.nearest(stack)
+        if entry_id is None:
+            print("No overlapping entry")
+            return
+        print(f"similarity={score:.2f} stack={sorted(question_bank.stacks[entry_id])}")
+        for q in question_bank.questions[entry_id]:
+            print(f"  {q}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+from .cache_utils import LRUTTLCache, SqliteKV
+from .llm_client import agenerate_technical_questions, INTERACTIVE
+
+load_dotenv()
+
+QUESTION_CACHE_SIZE = int(os.getenv("QUESTION_CACHE_SIZE", "2048"))
+QUESTION_CACHE_TTL_SECONDS = float(os.getenv("QUESTION_CACHE_TTL_SECONDS", "86400"))
+# Optional SQLite file so generated questions survive restarts (empty = disabled)
+QUESTION_CACHE_DB_PATH = os.getenv("QUESTION_CACHE_DB_PATH", "")
+
+_memory = LRUTTLCache(max_size=QUESTION_CACHE_SIZE, ttl=QUESTION_CACHE_TTL_SECONDS)
+_durable = SqliteKV(QUESTION_CACHE_DB_PATH, table="tech_questions") if QUESTION_CACHE_DB_PATH else None
+# Stack key -> in-flight generation shared by concurrent requests
+_inflight = {}
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+def normalize_stack(tech_stack) -> list:
+    """Case-folded, de-duplicated, sorted tech stack"""
+    return sorted({t.strip().casefold() for t in tech_stack if t and t.strip()})
+
+def stack_key(tech_stack) -> str:
+    return "|".join(normalize_stack(tech_stack))
+
+def _lookup(key: str):
+    questions = _memory.get(key)
+    if questions is not None:
+        _stats["hits"] += 1
+        return questions
+    if _durable is not None:
+        entry = _durable.get(key)
+        if entry and time.time() - entry["created_at"] < QUESTION_CACHE_TTL_SECONDS:
+            _stats["disk_hits"] += 1
+            _memory.set(key, entry["questions"])
+            return entry["questions"]
+    return None
+
+async def _generate_and_store(key: str, tech_stack, priority):
+    try:
+        questions = await agenerate_technical_questions(tech_stack, priority=priority)
+    except Exception:
+        _stats["errors"] += 1
+        raise
+    _memory.set(key, questions)
+    if _durable is not None:
+        _durable.set(key, {"questions": questions, "created_at": time.time()})
+    return questions
+
+async def get_technical_questions(tech_stack, priority=INTERACTIVE) -> list:
+    """Return questions for a tech stack, generating them at most once per stack.
+
+    Concurrent misses for the same normalized stack share one upstream call
+    (scheduled at the first caller's priority). Failed generations are not
+    cached.
+    """
+    key = stack_key(tech_stack)
+    questions = _lookup(key)
+    if questions is not None:
+        return list(questions)
+
+    task = _inflight.get(key)
+    if task is None:
+        _stats["misses"] += 1
+        task = asyncio.ensure_future(_generate_and_store(key, tech_stack, priority))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        _stats["coalesced"] += 1
+    # Shield so one cancelled caller doesn't cancel the call other callers are waiting on
+    return list(await asyncio.shield(task))
+
+def cache_stats() -> dict:
+    return {
+        **_stats,
+        "size": len(_memory),
+        "max_size": QUESTION_CACHE_SIZE,
+        "in_flight": len(_inflight),
+        "persistent": _durable is not None,
+    }
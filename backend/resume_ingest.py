@@ -0,0 +1,232 @@
+"""
+Bulk resume ingestion shared by /parse-resume/batch and the CLI.
+
+Resumes are parsed concurrently on the parse pool and reported one NDJSON
+event per file as soon as each finishes. Parsed candidates with an email
+are upserted to storage in batches. A failing file or batch is reported
+and skipped; it never aborts the run. The last event is a throughput
+summary.
+
+CLI:
+    python -m backend.resume_ingest ./resumes --batch-size 100
+    python -m backend.resume_ingest ./resumes --no-store > parsed.ndjson
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import re
+import sys
+import time
+import uuid
+import zipfile
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from .models import CandidateInfo
+from .parse_cache import content_hash, get_parsed, set_parsed
+from .parse_pool import parse_pdf_bytes, shutdown_pool, PARSE_POOL_WORKERS, MAX_UPLOAD_BYTES
+from .candidate_store import astore_candidates, aclose_store
+
+load_dotenv()
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "100"))
+# Resumes parsed concurrently per batch run
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", str(PARSE_POOL_WORKERS * 2)))
+
+def is_zip(name: str, data: bytes) -> bool:
+    return name.lower().endswith(".zip") or data[:4] == b"PK\x03\x04"
+
+def iter_zip_members(name: str, data: bytes, max_member_bytes: int):
+    """Yield (member_name, bytes_or_error) for each PDF inside a zip archive.
+
+    An archive with no PDFs yields a single error for the archive itself.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile as e:
+        yield name, ValueError(f"Invalid zip archive: {e}")
+        return
+    found = False
+    with archive:
+        for info in archive.infolist():
+            if info.is_dir() or not info.filename.lower().endswith(".pdf"):
+                continue
+            found = True
+            member = f"{name}/{info.filename}"
+            # file_size comes from the archive header; checked before inflating
+            if info.file_size > max_member_bytes:
+                yield member, ValueError(f"File exceeds the {max_member_bytes} byte limit")
+                continue
+            try:
+                yield member, archive.read(info)
+            except Exception as e:
+                yield member, e
+    if not found:
+        yield name, ValueError("No PDF files in zip archive")
+
+def iter_directory(path: str, max_file_bytes: int, recursive: bool = True):
+    """Yield (relative_path, bytes_or_error) for PDFs (and zips of PDFs) under path"""
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            full_path = os.path.join(root, filename)
+            rel_path = os.path.relpath(full_path, path)
+            lower = filename.lower()
+            if not lower.endswith((".pdf", ".zip")):
+                continue
+            try:
+                with open(full_path, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                yield rel_path, e
+                continue
+            if lower.endswith(".zip"):
+                yield from iter_zip_members(rel_path, data, max_file_bytes)
+            elif len(data) > max_file_bytes:
+                yield rel_path, ValueError(f"File exceeds the {max_file_bytes} byte limit")
+            else:
+                yield rel_path, data
+        if not recursive:
+            break
+
+def candidate_from_parsed(parsed: dict, source: str) -> dict:
+    """Build a storable candidate dict from parse output; raises ValueError if unusable"""
+    if not parsed.get("email"):
+        raise ValueError("No email found")
+    years = re.search(r"\d+", parsed.get("experience") or "")
+    try:
+        candidate = CandidateInfo(
+            full_name=parsed.get("name") or "",
+            email=parsed["email"],
+            phone=parsed.get("phone") or "",
+            years_experience=int(years.group()) if years else 0,
+            desired_position="",
+            current_location="",
+            tech_stack=parsed.get("skills") or [],
+        )
+    except ValidationError as e:
+        raise ValueError(f"Invalid candidate data: {e.errors()[0].get('msg')}")
+    candidate_dict = candidate.dict()
+    candidate_dict["session_id"] = str(uuid.uuid4())
+    candidate_dict["source"] = source
+    return candidate_dict
+
+async def _parse_one(name: str, data) -> dict:
+    if isinstance(data, Exception):
+        return {"type": "result", "file": name, "status": "error", "error": str(data)}
+    try:
+        digest = content_hash(data)
+        parsed = get_parsed(digest)
+        if parsed is None:
+            parsed = await parse_pdf_bytes(data)
+            set_parsed(digest, parsed)
+        return {"type": "result", "file": name, "status": "ok", "sha256": digest, "parsed_data": parsed}
+    except asyncio.TimeoutError:
+        return {"type": "result", "file": name, "status": "error", "error": "Timed out parsing resume"}
+    except Exception as e:
+        return {"type": "result", "file": name, "status": "error", "error": str(e)}
+
+async def _flush(buffer: list) -> dict:
+    try:
+        await astore_candidates(buffer)
+        return {"type": "batch", "stored": len(buffer)}
+    except Exception as e:
+        return {"type": "batch", "stored": 0, "failed": len(buffer), "error": str(e)}
+
+async def ingest_resumes(items, store: bool = True, batch_size: int = INGEST_BATCH_SIZE,
+                         concurrency: int = INGEST_CONCURRENCY):
+    """Parse (name, bytes_or_error) items and yield NDJSON-ready event dicts.
+
+    Event types: "result" per file (in completion order), "batch" per
+    storage flush, and a final "summary" (with an "error" when there
+    were no files at all).
+    """
+    start = time.perf_counter()
+    counts = {"files": 0, "ok": 0, "failed": 0, "stored": 0, "not_stored": 0}
+    buffer = []
+    items = iter(items)
+    pending = set()
+    exhausted = False
+
+    try:
+        while pending or not exhausted:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    name, data = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.ensure_future(_parse_one(name, data)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                event = task.result()
+                counts["files"] += 1
+                if event["status"] != "ok":
+                    counts["failed"] += 1
+                    yield event
+                    continue
+                counts["ok"] += 1
+                if store:
+                    try:
+                        buffer.append(candidate_from_parsed(event["parsed_data"], event["file"]))
+                        event["queued_for_storage"] = True
+                    except ValueError as e:
+                        counts["not_stored"] += 1
+                        event["queued_for_storage"] = False
+                        event["storage_error"] = str(e)
+                yield event
+                if len(buffer) >= batch_size:
+                    batch = await _flush(buffer)
+                    counts["stored"] += batch["stored"]
+                    counts["not_stored"] += batch.get("failed", 0)
+                    buffer = []
+                    yield batch
+    finally:
+        # Client went away mid-stream: don't leave parse jobs running for nobody
+        for task in pending:
+            task.cancel()
+
+    if buffer:
+        batch = await _flush(buffer)
+        counts["stored"] += batch["stored"]
+        counts["not_stored"] += batch.get("failed", 0)
+        yield batch
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "type": "summary",
+        **counts,
+        "elapsed_s": round(elapsed, 3),
+        "resumes_per_sec": round(counts["files"] / elapsed, 2) if elapsed > 0 else None,
+    }
+    if not counts["files"]:
+        summary["error"] = "No resumes to process"
+    yield summary
+
+async def _run_cli(args):
+    items = iter_directory(args.directory, MAX_UPLOAD_BYTES, recursive=not args.no_recursive)
+    try:
+        async for event in ingest_resumes(items, store=not args.no_store,
+                                          batch_size=args.batch_size, concurrency=args.concurrency):
+            print(json.dumps(event), flush=True)
+            if event["type"] == "summary":
+                print(f"Ingested {event['ok']}/{event['files']} resumes, stored {event['stored']} "
+                      f"in {event['elapsed_s']}s ({event['resumes_per_sec']} resumes/s)", file=sys.stderr)
+    finally:
+        shutdown_pool()
+        await aclose_store()
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a directory of resume PDFs (and zips) and store candidates")
+    parser.add_argument("directory")
+    parser.add_argument("--no-store", action="store_true", help="Parse only; do not upsert candidates")
+    parser.add_argument("--no-recursive", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=INGEST_CONCURRENCY)
+    asyncio.run(_run_cli(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
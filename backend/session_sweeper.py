@@ -0,0 +1,111 @@
+"""
+Background session cleanup.
+
+`/clear-session` only enqueues a session's candidate data here; a single
+background task deletes queued sessions in batches (one filter delete per
+batch instead of one per request). The same task runs a periodic TTL
+sweep that removes candidates whose `expires_at` has passed and durable
+transcripts idle for longer than SESSION_TTL_SECONDS, so abandoned
+interviews don't accumulate.
+"""
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+from .candidate_store import SESSION_TTL_SECONDS, aget_store
+from .conversation_store import purge_conversations
+
+load_dotenv()
+
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "300"))
+SESSION_SWEEP_BATCH_SIZE = int(os.getenv("SESSION_SWEEP_BATCH_SIZE", "500"))
+# Queued /clear-session deletes are flushed at least this often
+SESSION_DELETE_FLUSH_SECONDS = float(os.getenv("SESSION_DELETE_FLUSH_SECONDS", "1"))
+
+_pending = set()
+_wakeup = None
+_task = None
+_stats = {"queued": 0, "deleted_sessions": 0, "expired_points": 0, "purged_conversations": 0,
+          "failed_flushes": 0, "last_sweep": None}
+
+def enqueue_session_delete(session_id: str):
+    """Schedule a session's candidate data for deletion; returns immediately"""
+    _pending.add(session_id)
+    _stats["queued"] += 1
+    if _wakeup is not None and len(_pending) >= SESSION_SWEEP_BATCH_SIZE:
+        _wakeup.set()
+
+async def flush_pending() -> int:
+    """Delete queued sessions in batches; failed batches stay queued for the next flush"""
+    flushed = 0
+    while _pending:
+        batch = [_pending.pop() for _ in range(min(SESSION_SWEEP_BATCH_SIZE, len(_pending)))]
+        try:
+            await (await aget_store()).adelete_sessions(batch)
+        except Exception as e:
+            _pending.update(batch)
+            _stats["failed_flushes"] += 1
+            print(f"Error deleting {len(batch)} queued sessions (will retry): {e}")
+            break
+        flushed += len(batch)
+        _stats["deleted_sessions"] += len(batch)
+    return flushed
+
+async def sweep_expired() -> int:
+    """Delete expired candidates batch by batch, then purge stale transcripts"""
+    if SESSION_TTL_SECONDS <= 0:
+        return 0
+    now = int(time.time())
+    removed = 0
+    try:
+        store = await aget_store()
+        while True:
+            deleted = await store.adelete_expired(now, SESSION_SWEEP_BATCH_SIZE)
+            removed += deleted
+            if deleted < SESSION_SWEEP_BATCH_SIZE:
+                break
+            # Let request handlers run between batches
+            await asyncio.sleep(0)
+    except Exception as e:
+        print(f"Error sweeping expired sessions: {e}")
+    purged = await asyncio.to_thread(purge_conversations, now - SESSION_TTL_SECONDS)
+    _stats["expired_points"] += removed
+    _stats["purged_conversations"] += purged
+    _stats["last_sweep"] = now
+    if removed or purged:
+        print(f"Session sweep removed {removed} expired candidates and {purged} stale transcripts.")
+    return removed
+
+async def _run():
+    next_sweep = time.monotonic() + SESSION_SWEEP_INTERVAL_SECONDS
+    while True:
+        try:
+            await asyncio.wait_for(_wakeup.wait(), timeout=SESSION_DELETE_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wakeup.clear()
+        await flush_pending()
+        if time.monotonic() >= next_sweep:
+            await sweep_expired()
+            next_sweep = time.monotonic() + SESSION_SWEEP_INTERVAL_SECONDS
+
+def start_sweeper():
+    global _task, _wakeup
+    if _task is None:
+        _wakeup = asyncio.Event()
+        _task = asyncio.create_task(_run())
+
+async def stop_sweeper():
+    """Stop the background task and flush whatever is still queued"""
+    global _task, _wakeup
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task, _wakeup = None, None
+    await flush_pending()
+
+def sweeper_stats() -> dict:
+    return {**_stats, "pending": len(_pending), "ttl_seconds": SESSION_TTL_SECONDS}
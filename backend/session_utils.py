@@ -1,10 +1,28 @@
-from .qdrant_client import delete_session_data
+from .candidate_store import delete_session_data, adelete_session_data
+from .conversation_store import delete_conversation
+from .session_sweeper import enqueue_session_delete
 
 def delete_session(session_id: str) -> bool:
     print(f"Initiating deletion for session_id={session_id}")
+    delete_conversation(session_id)
     success = delete_session_data(session_id)
     if success:
         print(f"Session data for {session_id} deleted successfully.")
     else:
         print(f"Failed to delete session data for {session_id}.")
     return success
+
+async def adelete_session(session_id: str) -> bool:
+    print(f"Initiating deletion for session_id={session_id}")
+    delete_conversation(session_id)
+    success = await adelete_session_data(session_id)
+    if success:
+        print(f"Session data for {session_id} deleted successfully.")
+    else:
+        print(f"Failed to delete session data for {session_id}.")
+    return success
+
+def schedule_session_delete(session_id: str):
+    """Drop the transcript now; candidate data is deleted in the sweeper's next batch"""
+    delete_conversation(session_id)
+    enqueue_session_delete(session_id)
@@ -0,0 +1,221 @@
+"""
+Single-pass skill extraction over a loadable taxonomy.
+
+Exact mentions (canonical names and aliases such as "k8s" -> Kubernetes)
+are found with an Aho-Corasick automaton built once per process, so the
+cost of a scan depends on the text length, not on the taxonomy size.
+Near-misses are shortlisted through a character-bigram index, so only a
+handful of candidates get an exact similarity score instead of comparing
+each term against the whole taxonomy.
+
+Taxonomy files are either JSON:
+
+    {"skills": [{"name": "Kubernetes", "aliases": ["k8s"]},
+                {"name": "Go", "aliases": ["Golang"], "case_sensitive": true},
+                {"name": "TypeScript", "aliases": [{"name": "TS", "case_sensitive": true}]}]}
+
+(an alias may be an object to make just that alias case-sensitive),
+
+or CSV/plain text with one skill per line: `Kubernetes,k8s,kube`.
+"""
+import csv
+import json
+import os
+from collections import Counter, deque
+from difflib import SequenceMatcher
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "skills_taxonomy.json"),
+)
+# Same cutoff the old difflib.get_close_matches call used
+FUZZY_MIN_SIMILARITY = float(os.getenv("FUZZY_MIN_SIMILARITY", "0.7"))
+# Stricter cutoff when either side is this short: one edit in a 4-letter
+# word still scores 0.75 ("rest" vs "Rust")
+FUZZY_SHORT_TERM_LENGTH = 4
+FUZZY_SHORT_MIN_SIMILARITY = float(os.getenv("FUZZY_SHORT_MIN_SIMILARITY", "0.85"))
+# Index candidates rescored exactly per fuzzy lookup
+FUZZY_SHORTLIST_SIZE = 5
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+def _joined(text: str, i: int, step: int) -> bool:
+    """True if text[i] continues the token next to it (a word char, or a dot inside a dotted name)"""
+    if not 0 <= i < len(text):
+        return False
+    if _is_word_char(text[i]):
+        return True
+    return text[i] == "." and 0 <= i + step < len(text) and _is_word_char(text[i + step])
+
+def _bigrams(term: str) -> set:
+    padded = f" {term} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+class SkillMatcher:
+    def __init__(self, skills):
+        """`skills` is an iterable of dicts with name, optional aliases and case_sensitive.
+
+        An alias is a string or a {"name", "case_sensitive"} dict.
+        """
+        # Trie as parallel lists: child edges, failure links, and the
+        # (surface_form, canonical, case_sensitive) patterns ending at each node
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._forms = {}
+        # Lowercased case-sensitive forms -> the exact spelling they need
+        self._case_forms = {}
+        self.canonical_names = []
+
+        for entry in skills:
+            name = entry["name"].strip()
+            if not name:
+                continue
+            self.canonical_names.append(name)
+            entry_case_sensitive = bool(entry.get("case_sensitive"))
+            for form in [name] + list(entry.get("aliases") or []):
+                case_sensitive = entry_case_sensitive
+                if isinstance(form, dict):
+                    case_sensitive = case_sensitive or bool(form.get("case_sensitive"))
+                    form = form["name"]
+                form = form.strip()
+                if form:
+                    self._add_pattern(form, name, case_sensitive)
+        self._build_failure_links()
+        self._build_fuzzy_index()
+
+    def _add_pattern(self, form: str, canonical: str, case_sensitive: bool):
+        node = 0
+        for ch in form.lower():
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((form, canonical, case_sensitive))
+        if case_sensitive:
+            self._case_forms.setdefault(form.lower(), form)
+        self._forms.setdefault(form.lower(), canonical)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _build_fuzzy_index(self):
+        # Case-sensitive forms (acronyms like "ML") only ever match exactly
+        self._fuzzy_terms = [term for term in self._forms if term not in self._case_forms]
+        self._fuzzy_grams = [_bigrams(term) for term in self._fuzzy_terms]
+        self._gram_index = {}
+        for term_id, grams in enumerate(self._fuzzy_grams):
+            for gram in grams:
+                self._gram_index.setdefault(gram, []).append(term_id)
+
+    def find_all(self, text: str) -> list:
+        """Canonical skills mentioned in text, in order of first mention.
+
+        Matches are case-insensitive unless the entry is case_sensitive, and
+        must sit on word boundaries ("Go" does not match inside "Google",
+        "JS" does not match inside "Node.js").
+        """
+        lowered = text.lower()
+        # lower() can change length for some characters; only then are
+        # original-case checks skipped
+        aligned = len(lowered) == len(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        found = {}
+        node = 0
+        for end, ch in enumerate(lowered):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            for form, canonical, case_sensitive in out[node]:
+                if canonical in found:
+                    continue
+                start = end - len(form) + 1
+                if _is_word_char(form[0]) and _joined(lowered, start - 1, -1):
+                    continue
+                if _is_word_char(form[-1]) and _joined(lowered, end + 1, 1):
+                    continue
+                if case_sensitive and aligned and text[start:end + 1] != form:
+                    continue
+                found[canonical] = start
+        return sorted(found, key=found.get)
+
+    def fuzzy_match(self, term: str, min_similarity: float = FUZZY_MIN_SIMILARITY):
+        """Closest canonical skill for a (possibly misspelled) term, or None"""
+        original = term.strip()
+        term = original.lower()
+        if not term:
+            return None
+        exact = self._forms.get(term)
+        if exact and self._case_forms.get(term, original) == original:
+            return exact
+        grams = _bigrams(term)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._gram_index.get(gram, ()))
+        shortlist = sorted(
+            shared,
+            key=lambda t: 2 * shared[t] / (len(grams) + len(self._fuzzy_grams[t])),
+            reverse=True,
+        )[:FUZZY_SHORTLIST_SIZE]
+        best, best_score = None, 0.0
+        matcher = SequenceMatcher(b=term)
+        for term_id in shortlist:
+            candidate = self._fuzzy_terms[term_id]
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if min(len(term), len(candidate)) <= FUZZY_SHORT_TERM_LENGTH:
+                score = score if score >= FUZZY_SHORT_MIN_SIMILARITY else 0.0
+            if score > best_score:
+                best, best_score = term_id, score
+        if best is None or best_score < min_similarity:
+            return None
+        return self._forms[self._fuzzy_terms[best]]
+
+def load_taxonomy(path: str) -> list:
+    """Read a JSON or CSV/text taxonomy file into a list of skill dicts"""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data["skills"] if isinstance(data, dict) else data
+        return [{"name": e} if isinstance(e, str) else e for e in entries]
+    skills = []
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            row = [cell.strip() for cell in row if cell.strip()]
+            if row and not row[0].startswith("#"):
+                skills.append({"name": row[0], "aliases": row[1:]})
+    return skills
+
+_matcher = None
+
+def get_skill_matcher() -> SkillMatcher:
+    """Process-wide matcher, built on first use from SKILL_TAXONOMY_PATH"""
+    global _matcher
+    if _matcher is None:
+        if os.path.exists(SKILL_TAXONOMY_PATH):
+            skills = load_taxonomy(SKILL_TAXONOMY_PATH)
+        else:
+            from .pdf_parser import VALID_SKILLS
+            print(f"Skill taxonomy {SKILL_TAXONOMY_PATH} not found; using built-in skills.")
+            skills = [{"name": s} for s in VALID_SKILLS]
+        _matcher = SkillMatcher(skills)
+    return _matcher
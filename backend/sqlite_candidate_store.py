@@ -0,0 +1,126 @@
+import json
+import os
+import sqlite3
+import threading
+import numpy as np
+from .candidate_store import CandidateStore
+from .embeddings import EMBEDDING_DIM
+
+class SqliteCandidateStore(CandidateStore):
+    """Candidates in one SQLite table; similarity search is a NumPy scan.
+
+    Filterable fields are stored in their own columns so filters run in
+    SQL before any vectors are loaded. Fine for tests, benchmarks and
+    offline runs up to tens of thousands of candidates.
+    """
+
+    def __init__(self, path):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+    def setup(self):
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                "id TEXT PRIMARY KEY, session_id TEXT, years_experience INTEGER, "
+                "current_location TEXT, payload TEXT NOT NULL, vector BLOB NOT NULL, expires_at INTEGER)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(candidates)")}
+            if "expires_at" not in columns:
+                self._conn.execute("ALTER TABLE candidates ADD COLUMN expires_at INTEGER")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS candidates_session ON candidates (session_id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS candidates_years ON candidates (years_experience)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS candidates_expires ON candidates (expires_at)")
+            self._conn.commit()
+
+    def upsert(self, points, wait=True):
+        rows = [
+            (
+                point_id,
+                payload.get("session_id"),
+                payload.get("years_experience"),
+                payload.get("current_location"),
+                json.dumps(payload),
+                np.asarray(vector, dtype=np.float32).tobytes(),
+                payload.get("expires_at"),
+            )
+            for point_id, payload, vector in points
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO candidates "
+                "(id, session_id, years_experience, current_location, payload, vector, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def retrieve(self, point_id):
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM candidates WHERE id = ?", (point_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def search(self, query, limit=10, min_years_experience=None, max_years_experience=None,
+               locations=None, exclude_id=None):
+        if isinstance(query, str):
+            with self._lock:
+                row = self._conn.execute("SELECT vector FROM candidates WHERE id = ?", (query,)).fetchone()
+            if row is None:
+                return []
+            query = np.frombuffer(row[0], dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32)
+
+        clauses, params = [], []
+        if min_years_experience is not None:
+            clauses.append("years_experience >= ?")
+            params.append(min_years_experience)
+        if max_years_experience is not None:
+            clauses.append("years_experience <= ?")
+            params.append(max_years_experience)
+        if locations:
+            clauses.append(f"current_location IN ({', '.join('?' for _ in locations)})")
+            params.extend(locations)
+        if exclude_id:
+            clauses.append("id != ?")
+            params.append(exclude_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT payload, vector FROM candidates{where}", params).fetchall()
+        if not rows:
+            return []
+
+        matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32).reshape(len(rows), EMBEDDING_DIM)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = np.divide(matrix @ query, norms, out=np.zeros(len(rows), dtype=np.float32), where=norms > 0)
+        k = min(limit, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(float(scores[i]), json.loads(rows[i][0])) for i in top]
+
+    def delete_sessions(self, session_ids):
+        session_ids = list(session_ids)
+        with self._lock:
+            self._conn.execute(
+                f"DELETE FROM candidates WHERE session_id IN ({', '.join('?' for _ in session_ids)})",
+                session_ids,
+            )
+            self._conn.commit()
+
+    def delete_expired(self, now, limit):
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM candidates WHERE id IN "
+                "(SELECT id FROM candidates WHERE expires_at < ? LIMIT ?)",
+                (now, limit),
+            )
+            self._conn.commit()
+        return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,59 @@
+"""
+Compare sync vs async LLM client throughput against the stub server.
+
+The "sync" mode reproduces the old request path: every call runs
+`chat_with_llm` on a 40-thread pool, which is what Starlette gives plain
+`def` endpoints. The "async" mode awaits `achat_with_llm`, bounded only by
+the scheduler (LLM_MAX_CONCURRENCY and, if set, LLM_RPM_LIMIT/LLM_TPM_LIMIT).
+
+Run (in two shells, from the repo root):
+    python benchmarks/llm_stub_server.py --latency 0.5
+    GROQ_BASE_URL=http://127.0.0.1:9000/v1 GROQ_API_KEY=stub \\
+        python benchmarks/bench_llm_concurrency.py --requests 400
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.llm_client import chat_with_llm, achat_with_llm, LLM_MAX_CONCURRENCY  # noqa: E402
+
+MESSAGES = [
+    {"role": "system", "content": "You are a professional interviewer."},
+    {"role": "user", "content": "I mostly work with FastAPI and Docker."},
+]
+
+async def run_sync(n_requests, threads):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        await asyncio.gather(*[
+            loop.run_in_executor(pool, chat_with_llm, MESSAGES) for _ in range(n_requests)
+        ])
+
+async def run_async(n_requests):
+    await asyncio.gather(*[achat_with_llm(MESSAGES) for _ in range(n_requests)])
+
+def report(label, n_requests, elapsed):
+    print(f"{label:<28} {n_requests:>6} req  {elapsed:8.2f}s  {n_requests / elapsed:10.1f} req/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=40,
+                        help="Threadpool size for the sync baseline (Starlette default is 40)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    asyncio.run(run_sync(args.requests, args.threads))
+    report(f"sync ({args.threads} threads)", args.requests, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    asyncio.run(run_async(args.requests))
+    report(f"async (max in flight={LLM_MAX_CONCURRENCY})", args.requests, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
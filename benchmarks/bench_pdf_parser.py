@@ -0,0 +1,114 @@
+"""
+Per-stage benchmark for backend/pdf_parser.py.
+
+Generates synthetic resumes in memory (see generate_resumes.py) and times
+each stage separately: PDF text extraction, email regex, phone regex,
+name detection, skill matching and experience detection, plus the
+end-to-end parse with the default page budget and over all pages.
+Reports mean milliseconds per resume and throughput in resumes per
+second for each page count.
+
+Run:
+    python benchmarks/bench_pdf_parser.py --pages 1 10 100 --save bench_baseline.json
+    # after a change:
+    python benchmarks/bench_pdf_parser.py --compare bench_baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend import pdf_parser  # noqa: E402
+from backend.skill_matcher import get_skill_matcher  # noqa: E402
+from generate_resumes import LAYOUTS, make_resume  # noqa: E402
+
+def _lines(text):
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+STAGES = {
+    "extract_text": lambda data, text: pdf_parser.extract_text_from_pdf(data),
+    "email": lambda data, text: pdf_parser.extract_email(text),
+    "phone": lambda data, text: pdf_parser.extract_phone(text),
+    "name": lambda data, text: pdf_parser.extract_name(_lines(text)),
+    "skills": lambda data, text: pdf_parser.extract_skills(text),
+    "experience": lambda data, text: pdf_parser.extract_experience(text.lower()),
+    "total": lambda data, text: pdf_parser.parse_resume_bytes(data),
+    "total_all_pages": lambda data, text: pdf_parser.parse_resume_bytes(data, page_budget=0),
+}
+
+def time_stage(func, corpus, repeat):
+    """Median over `repeat` runs of the mean seconds per resume"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data, text in corpus:
+            func(data, text)
+        runs.append((time.perf_counter() - start) / len(corpus))
+    return statistics.median(runs)
+
+def run(pages_list, count, skill_density, repeat):
+    get_skill_matcher()  # exclude one-time automaton build from stage timings
+    results = {}
+    for pages in pages_list:
+        corpus = []
+        for i in range(count):
+            data = make_resume(pages, skill_density, LAYOUTS[i % len(LAYOUTS)], seed=i)
+            corpus.append((data, pdf_parser.extract_text_from_pdf(data)))
+        stages = {name: time_stage(func, corpus, repeat) * 1000 for name, func in STAGES.items()}
+        results[str(pages)] = {
+            "stages_ms": {name: round(ms, 4) for name, ms in stages.items()},
+            "resumes_per_sec": round(1000 / stages["total"], 2),
+            "chars_per_resume": int(statistics.mean(len(text) for _, text in corpus)),
+        }
+    return results
+
+def print_results(results, baseline=None):
+    stage_names = list(STAGES)
+    header = f"{'pages':>6} " + " ".join(f"{name:>15}" for name in stage_names) + f" {'resumes/s':>11}"
+    print("mean ms per resume" + (" (delta vs baseline)" if baseline else ""))
+    print(header)
+    for pages, row in results.items():
+        cells = []
+        for name in stage_names:
+            cell = f"{row['stages_ms'][name]:.3f}"
+            if baseline and pages in baseline:
+                base = baseline[pages]["stages_ms"].get(name)
+                if base:
+                    cell += f" {(row['stages_ms'][name] - base) / base:+.0%}"
+            cells.append(f"{cell:>15}")
+        print(f"{pages:>6} " + " ".join(cells) + f" {row['resumes_per_sec']:>11.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--count", type=int, default=5, help="Resumes per page count")
+    parser.add_argument("--skill-density", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="Write results as a baseline JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to diff against")
+    args = parser.parse_args()
+
+    results = run(args.pages, args.count, args.skill_density, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "params": vars(args),
+                "results": results,
+            }, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Compare Qdrant REST vs gRPC, sync vs async, for the operations the API uses:
+batched upserts (ingestion), filtered vector search (/candidates/search) and
+delete-by-filter (/clear-session).
+
+Runs against a local Qdrant server in a scratch collection that is dropped
+afterwards; the TalentScout collection is never touched.
+
+Run (from the repo root):
+    docker run -p 6333:6333 -p 6334:6334 qdrant/qdrant
+    python benchmarks/bench_qdrant_transport.py --points 5000 --ops 300 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from qdrant_client.models import VectorParams, Distance, PayloadSchemaType  # noqa: E402
+from backend.embeddings import EMBEDDING_DIM  # noqa: E402
+from backend.qdrant_client import (  # noqa: E402
+    remote_client, remote_async_client, _point_structs, _search_filter, _session_selector,
+)
+
+COLLECTION = "TalentScoutBench"
+SESSIONS = 200
+
+def make_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, EMBEDDING_DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [
+        (i, {"session_id": f"s{i % SESSIONS}", "years_experience": int(i % 15), "email": f"c{i}@example.com"},
+         vectors[i].tolist())
+        for i in range(n)
+    ]
+
+def reset_collection(client):
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(COLLECTION, vectors_config=VectorParams(size=EMBEDDING_DIM, distance=Distance.COSINE))
+    for field, schema in (("session_id", PayloadSchemaType.KEYWORD), ("years_experience", PayloadSchemaType.INTEGER)):
+        client.create_payload_index(COLLECTION, field_name=field, field_schema=schema)
+
+def summarize(latencies, elapsed):
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "ops": len(ms),
+        "p50_ms": statistics.median(ms),
+        "p95_ms": ms[int(0.95 * (len(ms) - 1))],
+        "ops_per_s": len(ms) / elapsed,
+    }
+
+def bench_sync(client, points, ops, batch_size):
+    results = {}
+    structs = _point_structs(points)
+    batches = [structs[i:i + batch_size] for i in range(0, len(structs), batch_size)]
+
+    latencies, start = [], time.perf_counter()
+    for batch in batches:
+        t = time.perf_counter()
+        client.upsert(COLLECTION, points=batch, wait=True)
+        latencies.append(time.perf_counter() - t)
+    results["upsert"] = summarize(latencies, time.perf_counter() - start)
+
+    latencies, start = [], time.perf_counter()
+    for i in range(ops):
+        t = time.perf_counter()
+        client.query_points(COLLECTION, query=points[i % len(points)][2], limit=10,
+                            query_filter=_search_filter(min_years_experience=3), with_payload=True)
+        latencies.append(time.perf_counter() - t)
+    results["search"] = summarize(latencies, time.perf_counter() - start)
+
+    latencies, start = [], time.perf_counter()
+    for i in range(min(ops, SESSIONS)):
+        t = time.perf_counter()
+        client.delete(COLLECTION, points_selector=_session_selector([f"s{i}"]))
+        latencies.append(time.perf_counter() - t)
+    results["delete"] = summarize(latencies, time.perf_counter() - start)
+    return results
+
+async def bench_async(client, points, ops, batch_size, concurrency):
+    results = {}
+    structs = _point_structs(points)
+    batches = [structs[i:i + batch_size] for i in range(0, len(structs), batch_size)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(latencies, coro_factory):
+        async with semaphore:
+            t = time.perf_counter()
+            await coro_factory()
+            latencies.append(time.perf_counter() - t)
+
+    async def run(name, factories):
+        latencies, start = [], time.perf_counter()
+        await asyncio.gather(*[timed(latencies, f) for f in factories])
+        results[name] = summarize(latencies, time.perf_counter() - start)
+
+    await run("upsert", [lambda b=b: client.upsert(COLLECTION, points=b, wait=True) for b in batches])
+    await run("search", [
+        lambda i=i: client.query_points(COLLECTION, query=points[i % len(points)][2], limit=10,
+                                        query_filter=_search_filter(min_years_experience=3), with_payload=True)
+        for i in range(ops)
+    ])
+    await run("delete", [
+        lambda i=i: client.delete(COLLECTION, points_selector=_session_selector([f"s{i}"]))
+        for i in range(min(ops, SESSIONS))
+    ])
+    return results
+
+def print_results(label, results):
+    for op, r in results.items():
+        print(f"{label:<14} {op:<7} {r['ops']:>6} ops  p50 {r['p50_ms']:8.2f} ms  "
+              f"p95 {r['p95_ms']:8.2f} ms  {r['ops_per_s']:10.1f} ops/s")
+
+async def run_all(args):
+    points = make_points(args.points)
+    for transport, prefer_grpc in (("rest", False), ("grpc", True)):
+        client = remote_client(args.url, prefer_grpc=prefer_grpc, api_key=args.api_key)
+        reset_collection(client)
+        print_results(f"{transport} sync", bench_sync(client, points, args.ops, args.batch_size))
+
+        reset_collection(client)
+        aclient = remote_async_client(args.url, prefer_grpc=prefer_grpc, api_key=args.api_key)
+        print_results(f"{transport} async", await bench_async(aclient, points, args.ops, args.batch_size,
+                                                             args.concurrency))
+        await aclient.close()
+        client.delete_collection(COLLECTION)
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--api-key")
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--ops", type=int, default=300, help="Searches (and up to this many deletes) per run")
+    parser.add_argument("--concurrency", type=int, default=16, help="In-flight requests for the async runs")
+    args = parser.parse_args()
+    asyncio.run(run_all(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Minimal OpenAI-compatible stub of the Groq chat completions API.
+
+Sleeps for a fixed latency before answering, so it behaves like a slow
+upstream without burning API quota. Streaming requests (`stream: true`)
+get the reply word by word with STUB_TOKEN_DELAY between chunks. With
+--rpm set, it enforces a requests-per-minute window like Groq: responses
+carry x-ratelimit-* headers and requests over the limit get a 429 with
+Retry-After. --tail-fraction/--tail-latency make a share of requests slow,
+to see the effect of hedging. Point the backend at it with:
+
+    GROQ_BASE_URL=http://127.0.0.1:9000/v1 GROQ_API_KEY=stub
+
+Run:
+    python benchmarks/llm_stub_server.py --port 9000 --latency 0.5
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+import json
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Body
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUB_LATENCY = float(os.getenv("STUB_LATENCY", "0.5"))
+STUB_TOKEN_DELAY = float(os.getenv("STUB_TOKEN_DELAY", "0.02"))
+# Share of requests that take STUB_TAIL_LATENCY instead of STUB_LATENCY
+STUB_TAIL_FRACTION = float(os.getenv("STUB_TAIL_FRACTION", "0"))
+STUB_TAIL_LATENCY = float(os.getenv("STUB_TAIL_LATENCY", "5"))
+# Requests per minute before answering 429 (0 = unlimited)
+STUB_RPM = int(os.getenv("STUB_RPM", "0"))
+STUB_REPLY = "Thanks! Can you walk me through a recent project where you used this stack?"
+
+app = FastAPI()
+_window = {"start": time.monotonic(), "count": 0}
+
+def rate_limit_headers():
+    """Count this request against the current one-minute window; None when over the limit"""
+    now = time.monotonic()
+    if now - _window["start"] >= 60:
+        _window["start"], _window["count"] = now, 0
+    reset = 60 - (now - _window["start"])
+    if _window["count"] >= STUB_RPM:
+        return None, reset
+    _window["count"] += 1
+    return {
+        "x-ratelimit-limit-requests": str(STUB_RPM),
+        "x-ratelimit-remaining-requests": str(STUB_RPM - _window["count"]),
+        "x-ratelimit-reset-requests": f"{reset:.2f}s",
+    }, reset
+
+@app.post("/v1/chat/completions")
+async def chat_completions(payload: dict = Body(...)):
+    headers = {}
+    if STUB_RPM:
+        headers, reset = rate_limit_headers()
+        if headers is None:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached for requests", "type": "requests", "code": "rate_limit_exceeded"}},
+                headers={"retry-after": str(max(1, round(reset)))},
+            )
+    await asyncio.sleep(STUB_TAIL_LATENCY if random.random() < STUB_TAIL_FRACTION else STUB_LATENCY)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    if payload.get("stream"):
+        return StreamingResponse(
+            stream_chunks(completion_id, payload.get("model", "stub")),
+            media_type="text/event-stream",
+            headers=headers,
+        )
+    return JSONResponse({
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": STUB_REPLY},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }, headers=headers)
+
+async def stream_chunks(completion_id, model):
+    """Emit STUB_REPLY word by word in OpenAI streaming chunk format"""
+    words = STUB_REPLY.split(" ")
+    for i, word in enumerate(words):
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "delta": {"content": word if i == 0 else " " + word},
+                    "finish_reason": None,
+                }
+            ],
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(STUB_TOKEN_DELAY)
+    yield "data: [DONE]\n\n"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Groq/OpenAI chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=STUB_LATENCY,
+                        help="Seconds to wait before each reply")
+    parser.add_argument("--rpm", type=int, default=STUB_RPM,
+                        help="Requests per minute before answering 429 (0 = unlimited)")
+    parser.add_argument("--tail-fraction", type=float, default=STUB_TAIL_FRACTION,
+                        help="Share of requests answered after --tail-latency instead")
+    parser.add_argument("--tail-latency", type=float, default=STUB_TAIL_LATENCY)
+    args = parser.parse_args()
+    STUB_LATENCY = args.latency
+    STUB_TAIL_FRACTION = args.tail_fraction
+    STUB_TAIL_LATENCY = args.tail_latency
+    STUB_RPM = args.rpm
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
@@ -4,6 +4,8 @@ import re
 import time
 import os
 import html
+import json
+import hashlib
 
 BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8000")
 
@@ -128,30 +130,15 @@ def reset():
         except Exception:
             pass
     keys_to_clear = ["step", "greet", "candidate_data", "session_id", 
-                     "chat_history", "parsed_data", "current_question",
+                     "chat_history", "parsed_data", "parsed_hash", "current_question",
                      "question_count", "interview_summary"]
     for key in keys_to_clear:
         if key in st.session_state:
             del st.session_state[key]
 
-def stream_text(text, placeholder):
-    words = text.split()
-    displayed_text = ""
-    for word in words:
-        displayed_text += word + " "
-        placeholder.markdown(f"""
-        <div style="
-            color: #ffffff;
-            background-color: #374151;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            margin-right: 20%;
-            font-style: italic;
-        ">
-            <strong>🤖 Interviewer:</strong> {displayed_text}▊
-        </div>
-        """, unsafe_allow_html=True)
-        time.sleep(0.05)
+def render_interviewer_reply(placeholder, text, streaming=False):
+    cursor = "▊" if streaming else ""
+    font_style = "font-style: italic;" if streaming else ""
     placeholder.markdown(f"""
     <div style="
         color: #ffffff;
@@ -159,11 +146,65 @@ def stream_text(text, placeholder):
         padding: 1rem;
         border-radius: 0.5rem;
         margin-right: 20%;
+        {font_style}
     ">
-        <strong>🤖 Interviewer:</strong> {text}
+        <strong>🤖 Interviewer:</strong> {text}{cursor}
     </div>
     """, unsafe_allow_html=True)
 
+def iter_sse_events(resp):
+    """Yield (event, data) pairs from a server-sent events response"""
+    event, data_lines = "message", []
+    for line in resp.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if not line:
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+def stream_reply(payload, placeholder, min_render_interval=0.05):
+    """Render /chat/stream tokens as they arrive and return the full reply.
+
+    Re-renders are throttled to min_render_interval so long replies don't
+    redraw the placeholder once per token.
+    """
+    parts = []
+    last_render = 0.0
+    with requests.post(f"{BACKEND_URL}/chat/stream", json=payload, stream=True, timeout=120) as resp:
+        resp.raise_for_status()
+        for event, data in iter_sse_events(resp):
+            if event == "error":
+                raise RuntimeError(data.get("detail", "Streaming failed"))
+            if event == "done":
+                reply = data.get("reply") or "".join(parts).strip()
+                render_interviewer_reply(placeholder, reply)
+                return reply
+            parts.append(data.get("token", ""))
+            now = time.monotonic()
+            if now - last_render >= min_render_interval:
+                render_interviewer_reply(placeholder, "".join(parts), streaming=True)
+                last_render = now
+    reply = "".join(parts).strip()
+    render_interviewer_reply(placeholder, reply)
+    return reply
+
+def wait_for_job(job_id, timeout=90, interval=1.0):
+    """Poll /jobs/{job_id} until it finishes; returns the job record (None on timeout)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        resp = requests.get(f"{BACKEND_URL}/jobs/{job_id}", timeout=10)
+        resp.raise_for_status()
+        job = resp.json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(interval)
+    return None
+
 st.title("🎯 TalentScout AI Hiring Assistant")
 st.markdown("---")
 
@@ -188,12 +229,23 @@ elif st.session_state.step == 1:
         uploaded_file = st.file_uploader("Upload your Resume (PDF)", type=["pdf"])
         if uploaded_file is not None:
             try:
-                files = {"file": ("resume.pdf", uploaded_file.getvalue(), "application/pdf")}
-                resp = requests.post(f"{BACKEND_URL}/parse-resume", files=files)
-                if resp.status_code == 200:
-                    parsed = resp.json()["parsed_data"]
+                pdf_bytes = uploaded_file.getvalue()
+                digest = hashlib.sha256(pdf_bytes).hexdigest()
+                if st.session_state.get("parsed_hash") == digest:
+                    # Already parsed on an earlier rerun; nothing to send
+                    parsed = st.session_state.parsed_data
+                else:
+                    parsed = None
+                    resp = requests.get(f"{BACKEND_URL}/parse-resume/{digest}")
+                    if resp.status_code != 200:
+                        files = {"file": ("resume.pdf", pdf_bytes, "application/pdf")}
+                        resp = requests.post(f"{BACKEND_URL}/parse-resume", files=files)
+                    if resp.status_code == 200:
+                        parsed = resp.json()["parsed_data"]
+                        st.session_state.parsed_data = parsed
+                        st.session_state.parsed_hash = digest
+                if parsed is not None:
                     st.success("✅ Resume parsed successfully!")
-                    st.session_state.parsed_data = parsed
                     with st.expander("📋 Extracted Information"):
                         st.write(f"**Name:** {parsed.get('name', 'Not found')}")
                         st.write(f"**Email:** {parsed.get('email', 'Not found')}")
@@ -322,51 +374,41 @@ elif st.session_state.step == 2:
         
         if st.session_state.question_count >= MAX_QUESTIONS:
             st.session_state.final_message = "Thank you for completing the full interview! I have all the information I need."
+            # Record the last answer server-side so the assessment includes it
+            try:
+                requests.post(f"{BACKEND_URL}/chat/final", json={
+                    "session_id": st.session_state.session_id,
+                    "user_message": user_input,
+                    "closing_message": st.session_state.final_message,
+                }, timeout=10).raise_for_status()
+            except Exception as e:
+                st.warning(f"Your last answer could not be saved for the assessment: {e}")
             st.session_state.chat_history.append({"role": "assistant", "content": st.session_state.final_message})
             st.session_state.step = 3
             st.rerun()
             
+        # The backend keeps the transcript; only the first turn seeds it with
+        # the client-side opening question.
         conversation_history = [
             {"role": msg["role"], "content": msg["content"]}
             for msg in st.session_state.chat_history[:-1]
-        ]
+        ] if len(st.session_state.chat_history) <= 2 else None
         
         typing_placeholder = st.empty()
         typing_placeholder.markdown('<div class="streaming-text">🤖 Interviewer is typing...</div>', unsafe_allow_html=True)
         
         try:
-            enhanced_prompt = f"""
-            You are conducting a professional technical interview. This is question #{st.session_state.question_count + 1}.
-            Candidate Info:
-            - Name: {st.session_state.candidate_data.get('full_name', 'N/A')}
-            - Experience: {st.session_state.candidate_data.get('years_experience', 0)} years
-            - Position: {st.session_state.candidate_data.get('desired_position', 'N/A')}
-            - Tech Stack: {', '.join(st.session_state.candidate_data.get('tech_stack', []))}
-            Guidelines:
-            - Ask one focused question at a time
-            - Make questions progressively more technical
-            - Ask follow-up questions based on their responses
-            - Keep questions relevant to their stated tech stack
-            - Be professional but conversational
-            User's response: {user_input}
-            """
-            
-            resp = requests.post(f"{BACKEND_URL}/chat", json={
+            payload = {
                 "session_id": st.session_state.session_id,
-                "user_message": enhanced_prompt,
-                "conversation_history": conversation_history
-            })
-            
-            if resp.status_code == 200:
-                data = resp.json()
-                reply = data["reply"]
-                
-                typing_placeholder.empty()
-                response_placeholder = st.empty()
-                stream_text(reply, response_placeholder)
+                "user_message": user_input,
+            }
+            if conversation_history:
+                payload["conversation_history"] = conversation_history
+            # The typing indicator is replaced in place by the streamed reply
+            reply = stream_reply(payload, typing_placeholder)
+            if reply:
                 st.session_state.chat_history.append({"role": "assistant", "content": reply})
                 st.session_state.question_count += 1
-                time.sleep(1)
                 st.rerun()
             else:
                 typing_placeholder.empty()
@@ -384,49 +426,27 @@ elif st.session_state.step == 2:
 elif st.session_state.step == 3:
     st.header("📊 Interview Summary")
     
-    # Generate AI summary of the interview
+    # The backend keeps a rolling assessment updated after every answer;
+    # refresh=true queues a job for any answers it hasn't covered yet
     if "interview_summary" not in st.session_state:
         try:
-            # Prepare conversation for summary generation
-            conversation_text = "\n".join([
-                f"{'Candidate' if msg['role'] == 'user' else 'Interviewer'}: {msg['content']}"
-                for msg in st.session_state.chat_history
-            ])
-            
-            summary_prompt = f"""
-            Generate a comprehensive interview summary based on the following conversation:
-            
-            Candidate Information:
-            - Name: {st.session_state.candidate_data.get('full_name')}
-            - Experience: {st.session_state.candidate_data.get('years_experience')} years
-            - Position Applied: {st.session_state.candidate_data.get('desired_position')}
-            - Tech Stack: {', '.join(st.session_state.candidate_data.get('tech_stack', []))}
-            
-            Interview Conversation:
-            {conversation_text}
-            
-            Please provide a structured summary with:
-            1. Overall Assessment (1-2 paragraphs)
-            2. Technical Skills Evaluation
-            3. Communication Skills
-            4. Strengths Identified
-            5. Areas for Improvement
-            6. Recommendation (Hire/Don't Hire/Further Review)
-            7. Suggested Next Steps
-            
-            Keep it professional and objective.
-            """
-            
-            resp = requests.post(f"{BACKEND_URL}/chat", json={
-                "session_id": st.session_state.session_id,
-                "user_message": summary_prompt,
-                "conversation_history": []
-            })
-            
-            if resp.status_code == 200:
-                st.session_state.interview_summary = resp.json()["reply"]
-            else:
-                st.session_state.interview_summary = "Summary generation failed. Please review the conversation manually."
+            resp = requests.get(
+                f"{BACKEND_URL}/summary/{st.session_state.session_id}",
+                params={"refresh": "true"},
+                timeout=10,
+            )
+            summary = None
+            if resp.status_code == 202:
+                with st.spinner("Finalizing the assessment..."):
+                    job = wait_for_job(resp.json()["job_id"])
+                if job and job["status"] == "succeeded":
+                    summary = job["result"]["summary"]
+                else:
+                    # Fall back to the latest rolling version, if any
+                    summary = resp.json().get("summary")
+            elif resp.status_code == 200:
+                summary = resp.json().get("summary")
+            st.session_state.interview_summary = summary or "Summary generation failed. Please review the conversation manually."
                 
         except Exception as e:
             st.session_state.interview_summary = f"Error generating summary: {e}"
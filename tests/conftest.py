@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# Configure the backend before it is imported: no network, throwaway storage
+_tmp = tempfile.mkdtemp(prefix="talentscout-tests-")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("GROQ_BASE_URL", "http://127.0.0.1:9/v1")
+os.environ["CANDIDATE_STORE"] = "sqlite"
+os.environ["CANDIDATE_DB_PATH"] = os.path.join(_tmp, "candidates.db")
+os.environ["CONVERSATION_DB_PATH"] = ""
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,40 @@
+import asyncio
+
+from backend.admission import Limiter
+
+
+def test_cancelled_waiter_does_not_lose_the_slot():
+    async def scenario():
+        limiter = Limiter("test_race", concurrency=1, queue=4)
+        slot = await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        # Cancel the queued request and release the slot in the same tick
+        queued.cancel()
+        slot.release()
+        await asyncio.gather(queued, return_exceptions=True)
+        assert queued.cancelled()
+        assert limiter.stats()["active"] == 0
+        assert limiter.stats()["queue_depth"] == 0
+        slot = await asyncio.wait_for(limiter.acquire(), 1)
+        slot.release()
+        assert limiter.stats()["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_release_hands_slot_to_next_live_waiter():
+    async def scenario():
+        limiter = Limiter("test_handover", concurrency=1, queue=4)
+        slot = await limiter.acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        first.cancel()
+        slot.release()
+        handed = await asyncio.wait_for(second, 1)
+        assert limiter.stats()["active"] == 1
+        handed.release()
+        assert limiter.stats()["active"] == 0
+
+    asyncio.run(scenario())
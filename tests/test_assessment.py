@@ -0,0 +1,53 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import assessment, main
+from backend.conversation_store import append_messages, save_profile
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    async def fake_llm(messages, **kwargs):
+        calls.append(messages)
+        return f"Assessment v{len(calls)}"
+
+    monkeypatch.setattr(assessment, "achat_with_llm", fake_llm)
+    return calls
+
+def wait_for_job(client, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def test_final_answer_reaches_assessment(llm_calls):
+    session_id = "final-answer-session"
+    save_profile(session_id, {"full_name": "Test Candidate", "tech_stack": ["Python"]})
+    append_messages(session_id, [
+        {"role": "assistant", "content": "What is a Python generator?"},
+        {"role": "user", "content": "A function that yields values lazily."},
+    ])
+    with TestClient(main.app) as client:
+        resp = client.post("/chat/final", json={
+            "session_id": session_id,
+            "user_message": "FINAL ANSWER: I would use asyncio.gather.",
+            "closing_message": "Thank you for completing the interview!",
+        })
+        assert resp.status_code == 202
+        assert resp.json()["up_to_date"] is False
+
+        resp = client.get(f"/summary/{session_id}", params={"refresh": "true"})
+        assert resp.status_code == 202
+        job = wait_for_job(client, resp.json()["job_id"])
+
+    assert job["status"] == "succeeded"
+    assert job["result"]["up_to_date"] is True
+    assert job["result"]["turns_covered"] == 4
+    prompt = "\n".join(m["content"] for m in llm_calls[-1])
+    assert "FINAL ANSWER: I would use asyncio.gather." in prompt
@@ -0,0 +1,39 @@
+from fastapi.testclient import TestClient
+
+from backend import main
+
+def candidate(email, name, stack):
+    return {
+        "full_name": name,
+        "email": email,
+        "phone": "+15550000000",
+        "years_experience": 4,
+        "desired_position": "Backend Engineer",
+        "current_location": "Pune",
+        "tech_stack": stack,
+    }
+
+def test_search_results_omit_contact_details_and_session_ids():
+    with TestClient(main.app) as client:
+        resp = client.post("/candidate-info/batch", json=[
+            candidate("search-a@example.com", "Search A", ["Python", "Docker"]),
+            candidate("search-b@example.com", "Search B", ["Python", "Django"]),
+        ])
+        assert resp.status_code == 200
+        session_ids = resp.json()["session_ids"]
+
+        resp = client.post("/candidates/search", json={"tech_stack": ["Python"], "limit": 5})
+        assert resp.status_code == 200
+        results = resp.json()["results"]
+        assert results
+        for result in results:
+            assert set(result["candidate"]) == set(main.SEARCH_RESULT_FIELDS)
+        body = resp.text
+        assert "search-a@example.com" not in body
+        assert not any(session_id in body for session_id in session_ids)
+
+def test_search_like_unknown_email_looks_like_no_matches():
+    with TestClient(main.app) as client:
+        resp = client.post("/candidates/search", json={"like_email": "nobody@example.com"})
+        assert resp.status_code == 200
+        assert resp.json() == {"results": []}
@@ -0,0 +1,16 @@
+from backend.pdf_parser import extract_skills, parse_resume_text
+from backend.skill_matcher import get_skill_matcher
+
+def test_rest_is_an_exact_skill_not_a_rust_typo():
+    text = "Jane Doe\njane@example.com\nBuilt APIs using REST, GraphQL.\nSkills: Python, REST"
+    assert parse_resume_text(text)["skills"] == ["RESTful API", "GraphQL", "Python"]
+    assert get_skill_matcher().fuzzy_match("rest") is None
+
+def test_short_acronyms_are_case_sensitive():
+    assert extract_skills("ts files for the ml team, dl experiments and js snippets") == []
+    assert extract_skills("JS, TS, ML and DL") == ["JavaScript", "TypeScript", "Machine Learning", "Deep Learning"]
+
+def test_longer_typos_still_fuzzy_match():
+    matcher = get_skill_matcher()
+    assert matcher.fuzzy_match("Javscript") == "JavaScript"
+    assert matcher.fuzzy_match("Pyhton") == "Python"